@@ -0,0 +1,59 @@
+# animation.py
+import pygame
+from support import import_folder, import_tileset
+from game_data import levels
+
+## every animated sprite refers to one of these clips by name
+## format: 'name': (path_to_frames_folder_or_sheet, default_animation_speed, mirrored)
+## mirrored clips also carry horizontally flipped frames for sprites that can face left
+clip_data = {
+    'gold coin': ('../graphics/coins/gold', 0.15, False),
+    'silver coin': ('../graphics/coins/silver', 0.15, False),
+    'palm small': ('../graphics/terrain/palm_small', 0.15, False),
+    'palm large': ('../graphics/terrain/palm_large', 0.15, False),
+    'palm bg': ('../graphics/terrain/palm_bg', 0.15, False),
+    'enemy run': ('../graphics/enemy/run', 0.15, True),
+    'water': ('../graphics/decoration/water', 0.15, False),
+    'jump': ('../graphics/character/dust_particles/jump', 0.5, False),
+    'land': ('../graphics/character/dust_particles/land', 0.5, False),
+    'explosion': ('../graphics/enemy/explosion', 0.5, False),
+    'player idle': ('../graphics/character/idle', 0.15, True),
+    'player run': ('../graphics/character/run', 0.15, True),
+    'player jump': ('../graphics/character/jump', 0.15, True),
+    'player fall': ('../graphics/character/fall', 0.15, True),
+    'run dust': ('../graphics/character/dust_particles/run', 0.15, True),
+    'dragon': ('../graphics/dragon', 0.15, True),
+    'fireball': ('../graphics/character/fire_bullets.png', 0.25, True)
+}
+
+for level, level_data in levels.items():
+    clip_data[f'node {level}'] = (level_data['node_graphics'], 0.15, False)
+
+class Clip:
+    def __init__(self, frames, speed, mirrored = False):
+        self.frames = frames
+        self.speed = speed
+        if mirrored:
+            self.flipped_frames = [pygame.transform.flip(frame, True, False) for frame in frames]
+        else:
+            self.flipped_frames = frames
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame(self, frame_index, flipped = False):
+        if flipped:
+            return self.flipped_frames[int(frame_index)]
+        return self.frames[int(frame_index)]
+
+clips = {}
+
+def import_clip(name):
+    if name not in clips:
+        path, speed, mirrored = clip_data[name]
+        if path.endswith('.png'):
+            frames = import_tileset(path)
+        else:
+            frames = import_folder(path)
+        clips[name] = Clip(frames, speed, mirrored)
+    return clips[name]
@@ -0,0 +1,106 @@
+# audio.py
+import os
+import pygame
+from settings import music_fade_time, music_volume
+
+# name: (path, volume, voices), voices is how many copies of the sound can play at the same time
+sound_data = {
+    'coin': ('../audio/effects/coin.wav', 1, 2),
+    'stomp': ('../audio/effects/stomp.wav', 1, 2),
+    'jump': ('../audio/effects/jump.wav', 0.8, 1),
+    'hit': ('../audio/effects/hit.wav', 1, 1),
+}
+
+# background tracks, streamed from disk by pygame.mixer.music instead of decoded into memory
+music_data = {
+    'overworld': '../audio/overworld_music.wav',
+    'level': '../audio/level_music.wav',
+}
+
+class AudioManager:
+    def __init__(self):
+        self.ready = False
+        self.sounds = {}
+        # reserved mixer channels of every sound, the one that started playing longest ago first
+        self.channels = {}
+        self.music_files = {}
+
+        # the track that should be playing, and when the one before it started fading out
+        self.music = None
+        self.fade_start = None
+
+    def setup(self):
+        # loads every sound once, without a mixer (no audio device) the game simply stays silent
+        if self.ready or not pygame.mixer.get_init():
+            return
+        self.ready = True
+
+        for name, (path, volume, voices) in sound_data.items():
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (FileNotFoundError, pygame.error) as error:
+                print(f'Could not load sound {path}: {error}')
+                continue
+            sound.set_volume(volume)
+            self.sounds[name] = sound
+
+        voice_count = sum(sound_data[name][2] for name in self.sounds)
+        if pygame.mixer.get_num_channels() < voice_count:
+            pygame.mixer.set_num_channels(voice_count)
+        pygame.mixer.set_reserved(voice_count)
+        channel_index = 0
+        for name in self.sounds:
+            voices = sound_data[name][2]
+            self.channels[name] = [pygame.mixer.Channel(channel_index + voice) for voice in range(voices)]
+            channel_index += voices
+
+        for name, path in music_data.items():
+            if os.path.exists(path):
+                self.music_files[name] = path
+            else:
+                print(f'Could not find music {path}, it will be silent')
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        channels = self.channels[name]
+        # a free voice if there is one, otherwise the oldest voice is cut off
+        channel = next((channel for channel in channels if not channel.get_busy()), channels[0])
+        channels.remove(channel)
+        channels.append(channel)
+        channel.play(sound)
+
+    def play_music(self, name):
+        # fades the current track out and the new one in, over music_fade_time ms in total
+        if name == self.music:
+            return
+        self.music = name
+        if not self.ready:
+            return
+        if pygame.mixer.music.get_busy():
+            self.fade_start = pygame.time.get_ticks()
+        else:
+            self.start_music()
+
+    def start_music(self):
+        self.fade_start = None
+        path = self.music_files.get(self.music)
+        if path is None:
+            pygame.mixer.music.stop()
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(music_volume)
+        pygame.mixer.music.play(loops = -1, fade_ms = music_fade_time // 2)
+
+    def update(self):
+        # called once a frame, runs the fade out without blocking the game
+        if self.fade_start is None:
+            return
+        progress = (pygame.time.get_ticks() - self.fade_start) / (music_fade_time // 2)
+        if progress >= 1:
+            self.start_music()
+        else:
+            pygame.mixer.music.set_volume(music_volume * (1 - progress))
+
+audio = AudioManager()
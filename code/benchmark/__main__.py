@@ -0,0 +1,71 @@
+# run from the code folder:
+#   python -m benchmark run --columns 100 1000 10000 --enemies 0 500 5000 --output results.json
+#   python -m benchmark compare old.json new.json --threshold 0.1
+import os
+import sys
+import json
+import argparse
+import itertools
+import subprocess
+
+# no window or sound, this has to happen before pygame starts up
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog = 'python -m benchmark')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+
+    run = commands.add_parser('run', help = 'run every combination of level size and enemy count')
+    run.add_argument('--columns', type = int, nargs = '+', default = [100, 1000, 10000])
+    run.add_argument('--enemies', type = int, nargs = '+', default = [0, 500, 5000])
+    run.add_argument('--coins', type = float, default = 0.3, help = 'share of the air cells holding a coin')
+    run.add_argument('--frames', type = int, default = 600)
+    run.add_argument('--warmup', type = int, default = 60, help = 'frames run before timing starts')
+    run.add_argument('--seed', type = int, default = 0)
+    run.add_argument('--output', help = 'json file for the results, printed when left out')
+
+    # one scenario in this process, used by run so every scenario gets its own peak memory
+    scenario = commands.add_parser('scenario')
+    scenario.add_argument('columns', type = int)
+    scenario.add_argument('enemies', type = int)
+    scenario.add_argument('coins', type = float)
+    scenario.add_argument('frames', type = int)
+    scenario.add_argument('warmup', type = int)
+    scenario.add_argument('seed', type = int)
+
+    compare = commands.add_parser('compare', help = 'flag regressions between two result files')
+    compare.add_argument('old')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type = float, default = 0.1, help = 'allowed slowdown, 0.1 is 10%%')
+    return parser.parse_args()
+
+def run_all(args):
+    scenarios = []
+    for columns, enemies in itertools.product(args.columns, args.enemies):
+        command = [sys.executable, '-m', 'benchmark', 'scenario', str(columns), str(enemies), str(args.coins), str(args.frames), str(args.warmup), str(args.seed)]
+        output = subprocess.run(command, check = True, capture_output = True, text = True).stdout
+        # the result is the last line, pygame and the game may print before it
+        scenario = json.loads(output.strip().splitlines()[-1])
+        print(f"{scenario['name']}: frame p50 {scenario['frame']['p50']} ms, p99 {scenario['frame']['p99']} ms, peak rss {scenario['peak_rss_kb']} kb", file = sys.stderr)
+        scenarios.append(scenario)
+
+    results = json.dumps({'frames': args.frames, 'warmup': args.warmup, 'seed': args.seed, 'scenarios': scenarios}, indent = 2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(results)
+    else:
+        print(results)
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.command == 'run':
+        run_all(args)
+    elif args.command == 'scenario':
+        from benchmark.runner import run_scenario
+        print(json.dumps(run_scenario(args.columns, args.enemies, args.coins, args.frames, args.warmup, args.seed)))
+    else:
+        from benchmark.compare import compare
+        regressions = compare(args.old, args.new, args.threshold)
+        print(f'{len(regressions)} regressions above {args.threshold:.0%}')
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,40 @@
+# compare.py
+import json
+
+compared_phases = ['frame', 'update', 'collision', 'draw']
+compared_stats = ['p50', 'p90', 'p99']
+
+# differences below this many milliseconds are noise, whatever the ratio
+min_difference_ms = 0.05
+
+def load_results(path):
+    with open(path) as file:
+        return {scenario['name']: scenario for scenario in json.load(file)['scenarios']}
+
+def changes(old, new):
+    # (metric, old value, new value) of every timing and the peak memory of one scenario
+    for phase in compared_phases:
+        for stat in compared_stats:
+            yield f'{phase} {stat}', old[phase][stat], new[phase][stat]
+    if old.get('peak_rss_kb') and new.get('peak_rss_kb'):
+        yield 'peak rss kb', old['peak_rss_kb'], new['peak_rss_kb']
+
+def compare(old_path, new_path, threshold):
+    # prints every metric and returns the regressions, those that got worse by more than threshold (0.1 = 10%)
+    old_results = load_results(old_path)
+    new_results = load_results(new_path)
+    regressions = []
+    for name, new in new_results.items():
+        old = old_results.get(name)
+        if old is None:
+            print(f'{name}: not in {old_path}')
+            continue
+        print(name)
+        for metric, old_value, new_value in changes(old, new):
+            ratio = new_value / old_value - 1 if old_value else 0
+            regressed = ratio > threshold and (metric == 'peak rss kb' or new_value - old_value > min_difference_ms)
+            flag = '  REGRESSION' if regressed else ''
+            print(f'    {metric:<16}{old_value:>12}{new_value:>12}{ratio:>+9.1%}{flag}')
+            if regressed:
+                regressions.append((name, metric, old_value, new_value))
+    return regressions
@@ -0,0 +1,117 @@
+# runner.py
+import sys
+import random
+from time import perf_counter
+import numpy as np
+import pygame
+from settings import screen_width, screen_height
+from controls import controls
+from level import Level
+from benchmark.synthetic import synthetic_tile_map
+
+# Level methods counted as collision time, the rest of Level.update is update time
+collision_methods = ['horizontal_movement_collision', 'vertical_movement_collision',
+                     'check_loot_crate', 'check_coin_collisions', 'check_enemy_collisions', 'check_heart_collisions']
+
+def input_script(frames):
+    # run right the whole time, with a jump every 45 frames to reach the platforms
+    script = []
+    for frame in range(0, frames, 45):
+        script.append((frame, ['right', 'space']))
+        script.append((frame + 10, ['right']))
+    return script
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        # windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset // 1024
+        except (ImportError, AttributeError):
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macos, kilobytes everywhere else
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def percentiles(times):
+    # times in seconds, results in milliseconds
+    times = np.array(times) * 1000
+    return {
+        'mean': round(float(times.mean()), 4),
+        'p50': round(float(np.percentile(times, 50)), 4),
+        'p90': round(float(np.percentile(times, 90)), 4),
+        'p99': round(float(np.percentile(times, 99)), 4),
+        'max': round(float(times.max()), 4),
+    }
+
+class CollisionTimer:
+    # wraps the collision methods of one level and adds up their time per frame
+    def __init__(self, level):
+        self.elapsed = 0
+        for name in collision_methods:
+            setattr(level, name, self.timed(getattr(level, name)))
+
+    def timed(self, method):
+        def wrapper(*args):
+            start = perf_counter()
+            result = method(*args)
+            self.elapsed += perf_counter() - start
+            return result
+        return wrapper
+
+def run_scenario(columns, enemies, coin_density, frames, warmup, seed = 0):
+    pygame.init()
+    surface = pygame.display.set_mode((screen_width, screen_height))
+    random.seed(seed)
+    controls.set_script(input_script(warmup + frames))
+
+    tile_map = synthetic_tile_map(columns, enemies, coin_density, seed)
+    start = perf_counter()
+    level = Level(0, surface, lambda *args: None, lambda amount: None, lambda amount: None, [], tile_map)
+    level.finish_loading()
+    load_time = perf_counter() - start
+    collision_timer = CollisionTimer(level)
+
+    update_times = []
+    collision_times = []
+    draw_times = []
+    frame_times = []
+    drawn_sprites = []
+    total_sprites = []
+    for frame in range(warmup + frames):
+        pygame.event.pump()
+        controls.next_frame()
+        collision_timer.elapsed = 0
+
+        start = perf_counter()
+        level.update()
+        update_end = perf_counter()
+        level.draw()
+        end = perf_counter()
+
+        if frame >= warmup:
+            update_times.append(update_end - start - collision_timer.elapsed)
+            collision_times.append(collision_timer.elapsed)
+            draw_times.append(end - update_end)
+            frame_times.append(end - start)
+            drawn_sprites.append(level.camera.drawn_sprites)
+            total_sprites.append(level.camera.total_sprites)
+
+    return {
+        'name': f'columns={columns} enemies={enemies} coins={coin_density}',
+        'columns': columns,
+        'enemies': tile_map.count('enemies'),
+        'coins': tile_map.count('coins'),
+        'frames': frames,
+        'load_ms': round(load_time * 1000, 2),
+        'peak_rss_kb': peak_rss_kb(),
+        'frame': percentiles(frame_times),
+        'update': percentiles(update_times),
+        'collision': percentiles(collision_times),
+        'draw': percentiles(draw_times),
+        # sprites drawn and in the drawn groups per frame, on average, to see how much culling skips
+        'drawn_sprites': round(sum(drawn_sprites) / frames, 1),
+        'total_sprites': round(sum(total_sprites) / frames, 1),
+    }
@@ -0,0 +1,53 @@
+# synthetic.py
+import numpy as np
+from settings import vertical_lile_number
+from compiled_level import layer_names
+from tilemap import TileMap
+
+# terrain tileset indices
+grass_top = 1
+ground = 5
+
+# rows of the generated levels
+ground_row = vertical_lile_number - 3
+walk_row = ground_row - 1
+platform_row = ground_row - 4
+
+def synthetic_tile_map(columns, enemies, coin_density, seed = 0):
+    # flat ground with a platform every 12 columns, enemies patrolling between constraints
+    # on the ground and the platforms, and coins scattered through the air above the ground
+    random = np.random.default_rng(seed)
+    rows = vertical_lile_number
+    layers = {name: np.full((rows, columns), -1, dtype = np.int16) for name in layer_names}
+
+    terrain = layers['terrain']
+    terrain[ground_row, :] = grass_top
+    terrain[ground_row + 1:, :] = ground
+    for col in range(6, columns - 4, 12):
+        terrain[platform_row, col:col + 4] = grass_top
+
+    # enemy spots: every free cell on top of the ground and the platforms
+    # constraints split the ground into stretches of 8 cells and close off every platform
+    constraints = layers['constraints']
+    constraints[walk_row, ::8] = 0
+    spots = [(walk_row, col) for col in range(columns) if constraints[walk_row, col] == -1]
+    for col in range(6, columns - 4, 12):
+        constraints[platform_row - 1, col - 1] = 0
+        constraints[platform_row - 1, col + 4] = 0
+        spots += [(platform_row - 1, col + offset) for offset in range(4)]
+
+    # keep the start clear so the player does not spawn inside an enemy
+    spots = [(row, col) for row, col in spots if col > 4]
+    if enemies > len(spots):
+        enemies = len(spots)
+    for index in random.choice(len(spots), enemies, replace = False):
+        layers['enemies'][spots[index]] = 0
+
+    coins = layers['coins']
+    air = coins[2:walk_row, :]
+    mask = (random.random(air.shape) < coin_density) & (terrain[2:walk_row, :] == -1)
+    air[mask] = random.integers(0, 2, air.shape, dtype = np.int16)[mask]
+
+    layers['player'][walk_row, 1] = 0
+    layers['player'][walk_row, columns - 2] = 1
+    return TileMap(layers)
@@ -0,0 +1,117 @@
+# cache.py
+import pygame
+import threading
+import weakref
+from collections import OrderedDict
+from settings import asset_cache_budget
+
+class AssetCache:
+    def __init__(self, budget = asset_cache_budget):
+        # surfaces keyed by (path, mode), least recently used first
+        # the budget only bounds what the cache itself keeps alive: most surfaces are also held by a
+        # long lived owner (animation clips, tilesets, sky backdrops), evicting those frees nothing
+        self.surfaces = OrderedDict()
+        self.budget = budget
+
+        # every surface handed out that is still in use somewhere, evicted or not, so it is never decoded twice
+        self.loaded = weakref.WeakValueDictionary()
+
+        # images decoded ahead of time by a worker thread, waiting for their conversion
+        # they count against the budget too
+        self.decoded = {}
+        self.decoded_bytes = 0
+        self.lock = threading.Lock()
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def surface_size(self, surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def load(self, path, mode = 'alpha'):
+        key = (path, mode)
+        if key in self.surfaces:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return self.surfaces[key]
+
+        surface = self.loaded.get(key)
+        if surface is not None:
+            # evicted, but its owner still holds it
+            self.hits += 1
+            self.store(key, surface)
+            return surface
+
+        self.misses += 1
+        with self.lock:
+            surface = self.decoded.pop(path, None)
+            if surface is not None:
+                self.decoded_bytes -= self.surface_size(surface)
+        if surface is None:
+            surface = pygame.image.load(path)
+        if mode == 'alpha':
+            surface = surface.convert_alpha()
+        elif mode == 'opaque':
+            surface = surface.convert()
+        self.store(key, surface)
+        return surface
+
+    def is_cached(self, path, mode = 'alpha'):
+        return (path, mode) in self.surfaces or (path, mode) in self.loaded
+
+    def predecode(self, path):
+        # safe to call from any thread: only decodes, the display format conversion happens in load
+        with self.lock:
+            if path in self.decoded:
+                return
+        surface = pygame.image.load(path)
+        size = self.surface_size(surface)
+        with self.lock:
+            # past the budget the image is dropped and load decodes it when it is needed
+            if path in self.decoded or self.bytes + self.decoded_bytes + size > self.budget:
+                return
+            self.decoded[path] = surface
+            self.decoded_bytes += size
+
+    def store(self, key, surface):
+        self.surfaces[key] = surface
+        self.loaded[key] = surface
+        self.bytes += self.surface_size(surface)
+        self.evict()
+
+    def evict(self):
+        # the newest entry always stays, even if it alone is over budget
+        while self.bytes > self.budget and len(self.surfaces) > 1:
+            _, surface = self.surfaces.popitem(last = False)
+            self.bytes -= self.surface_size(surface)
+            self.evictions += 1
+
+    def set_budget(self, budget):
+        self.budget = budget
+        self.evict()
+
+    def clear(self):
+        self.surfaces.clear()
+        self.loaded.clear()
+        with self.lock:
+            self.decoded.clear()
+            self.decoded_bytes = 0
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bytes': self.bytes,
+            # owned by the cache plus evicted surfaces that are still in use
+            'decoded_bytes': self.decoded_bytes,
+            'resident_bytes': sum(self.surface_size(surface) for surface in list(self.loaded.values())),
+            'entries': len(self.surfaces),
+            'budget': self.budget
+        }
+
+asset_cache = AssetCache()
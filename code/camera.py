@@ -0,0 +1,77 @@
+# camera.py
+import pygame
+from settings import screen_width, screen_height, view_margin, render_interpolation
+
+class Camera:
+    def __init__(self, surface):
+        self.display_surface = surface
+
+        # world position of the top left corner of the screen
+        self.offset = pygame.math.Vector2(0,0)
+        self.border = screen_width / 4
+
+        # interpolation: frames are drawn between the previous and the latest simulation step
+        self.previous_offset = pygame.math.Vector2(0,0)
+        self.draw_offset = pygame.math.Vector2(0,0)
+        self.previous_positions = {}
+        self.alpha = 1
+
+        # culling
+        self.view = pygame.Rect(0, 0, screen_width + view_margin * 2, screen_height + view_margin * 2)
+        self.drawn_sprites = 0
+        self.total_sprites = 0
+
+    def begin_step(self, moving_groups):
+        self.previous_offset.update(self.offset)
+        if render_interpolation:
+            self.previous_positions = {sprite: sprite.rect.topleft for group in moving_groups for sprite in group}
+
+    def begin_frame(self, alpha = 1):
+        self.drawn_sprites = 0
+        self.total_sprites = 0
+        self.alpha = alpha if render_interpolation else 1
+        self.draw_offset = self.previous_offset.lerp(self.offset, self.alpha)
+
+    def follow(self, target_rect, direction_x):
+        screen_x = target_rect.centerx - self.offset.x
+
+        if screen_x < self.border and direction_x < 0:
+            self.offset.x = target_rect.centerx - self.border
+        elif screen_x > screen_width - self.border and direction_x > 0:
+            self.offset.x = target_rect.centerx - (screen_width - self.border)
+
+    def apply_point(self, point):
+        return pygame.math.Vector2(point) - self.draw_offset
+
+    def interpolated_topleft(self, sprite):
+        # where a moving sprite is drawn this frame, between its positions of the last two steps
+        x, y = sprite.rect.topleft
+        previous_x, previous_y = self.previous_positions.get(sprite, (x, y))
+        return previous_x + (x - previous_x) * self.alpha, previous_y + (y - previous_y) * self.alpha
+
+    def visible(self, sprites):
+        self.view.topleft = (int(self.offset.x) - view_margin, int(self.offset.y) - view_margin)
+        view = self.view
+        return [sprite for sprite in sprites if view.colliderect(sprite.rect)]
+
+    def update(self, sprites, *args):
+        for sprite in self.visible(sprites):
+            sprite.update(*args)
+
+    def draw(self, sprites, interpolate = False):
+        # sprites that move every step pass interpolate to be drawn between their last two positions
+        visible_sprites = self.visible(sprites)
+        self.total_sprites += len(sprites)
+        self.drawn_sprites += len(visible_sprites)
+
+        offset_x = -int(self.draw_offset.x)
+        offset_y = -int(self.draw_offset.y)
+        if not interpolate or self.alpha == 1:
+            self.display_surface.blits([(sprite.image, sprite.rect.move(offset_x, offset_y)) for sprite in visible_sprites], False)
+            return
+
+        blits = []
+        for sprite in visible_sprites:
+            x, y = self.interpolated_topleft(sprite)
+            blits.append((sprite.image, (int(x) + offset_x, int(y) + offset_y)))
+        self.display_surface.blits(blits, False)
@@ -0,0 +1,75 @@
+# chunks.py
+import pygame
+from settings import tile_size, chunk_columns, chunk_rows, chunk_keep_distance, screen_width, screen_height
+
+class ChunkLayer:
+    def __init__(self, sprite_group):
+        self.sprite_group = sprite_group
+        self.chunk_width = chunk_columns * tile_size
+        self.chunk_height = chunk_rows * tile_size
+
+        # sprites overlapping each chunk, and the baked surface (None until drawn or after a change)
+        self.chunk_sprites = {}
+        self.chunk_surfaces = {}
+        # chunks that currently hold a baked surface
+        self.baked_chunks = set()
+        for sprite in sprite_group:
+            self.add(sprite)
+
+    def chunks_for(self, rect):
+        return [(col, row)
+            for row in range(rect.top // self.chunk_height, (rect.bottom - 1) // self.chunk_height + 1)
+            for col in range(rect.left // self.chunk_width, (rect.right - 1) // self.chunk_width + 1)]
+
+    def add(self, sprite):
+        for chunk in self.chunks_for(sprite.rect):
+            self.chunk_sprites.setdefault(chunk, []).append(sprite)
+            self.chunk_surfaces[chunk] = None
+            self.baked_chunks.discard(chunk)
+
+    def remove(self, sprite):
+        for chunk in self.chunks_for(sprite.rect):
+            if sprite in self.chunk_sprites.get(chunk, []):
+                self.chunk_sprites[chunk].remove(sprite)
+                self.chunk_surfaces[chunk] = None
+                self.baked_chunks.discard(chunk)
+
+    def bake(self, chunk):
+        col, row = chunk
+        chunk_x = col * self.chunk_width
+        chunk_y = row * self.chunk_height
+        surface = pygame.Surface((self.chunk_width, self.chunk_height), flags = pygame.SRCALPHA).convert_alpha()
+        surface.fill((0,0,0,0))
+        surface.blits([(sprite.image, sprite.rect.move(-chunk_x, -chunk_y)) for sprite in self.chunk_sprites[chunk]], False)
+        # chunks are mostly transparent, run-length encoding skips the empty runs when blitting
+        surface.set_alpha(255, pygame.RLEACCEL)
+        self.chunk_surfaces[chunk] = surface
+        self.baked_chunks.add(chunk)
+        return surface
+
+    def release_distant(self, view):
+        # only the chunks around the view keep their surface, so memory follows the view size and not the level width
+        keep = view.inflate(2 * chunk_keep_distance * self.chunk_width, 2 * chunk_keep_distance * self.chunk_height)
+        first_col, last_col = keep.left // self.chunk_width, (keep.right - 1) // self.chunk_width
+        first_row, last_row = keep.top // self.chunk_height, (keep.bottom - 1) // self.chunk_height
+        for chunk in [chunk for chunk in self.baked_chunks
+                      if not (first_col <= chunk[0] <= last_col and first_row <= chunk[1] <= last_row)]:
+            self.chunk_surfaces[chunk] = None
+            self.baked_chunks.remove(chunk)
+
+    def draw(self, camera):
+        offset_x = int(camera.draw_offset.x)
+        offset_y = int(camera.draw_offset.y)
+        view = pygame.Rect(offset_x, offset_y, screen_width, screen_height)
+
+        camera.total_sprites += len(self.sprite_group)
+        for chunk in self.chunks_for(view):
+            if chunk not in self.chunk_sprites:
+                continue
+            surface = self.chunk_surfaces[chunk]
+            if surface is None:
+                surface = self.bake(chunk)
+            col, row = chunk
+            camera.display_surface.blit(surface, (col * self.chunk_width - offset_x, row * self.chunk_height - offset_y))
+            camera.drawn_sprites += len(self.chunk_sprites[chunk])
+        self.release_distant(view)
@@ -0,0 +1,121 @@
+# compiled_level.py
+import os
+import struct
+import tempfile
+import numpy as np
+from support import import_csv_layout
+from game_data import levels
+from tmx import load_tmx
+
+## file layout: header, layer name table, source path list, then one int16 array of rows x columns per layer
+## header: magic, version, layer count, rows, columns, size of the source path list in bytes
+## every name in the table is padded to 16 bytes, the source paths are joined by newlines
+compiled_level_folder = '../levels/compiled'
+layer_names = ['terrain', 'coins', 'fg palms', 'bg palms', 'crates', 'enemies', 'constraints', 'player', 'grass', 'jump_boost', 'transport']
+magic = b'LVL1'
+version = 2
+header_format = '<4sHHHHH'
+name_size = 16
+
+def compiled_level_path(level):
+    return f'{compiled_level_folder}/level_{level}.lvl'
+
+def source_paths(level):
+    paths = [levels[level][name] for name in layer_names]
+    if 'map' in levels[level]:
+        paths.append(levels[level]['map'])
+    return paths
+
+def existing_sources(level):
+    return [path for path in source_paths(level) if os.path.exists(path)]
+
+def read_header(path):
+    # (layer names, rows, columns, source paths, data offset), None for a file of another format
+    header_size = struct.calcsize(header_format)
+    with open(path, 'rb') as file:
+        header = file.read(header_size)
+        if len(header) < header_size:
+            return None
+        file_magic, file_version, layer_count, rows, columns, sources_size = struct.unpack(header_format, header)
+        if file_magic != magic or file_version != version:
+            return None
+        names = [file.read(name_size).rstrip(b'\0').decode() for layer in range(layer_count)]
+        sources = file.read(sources_size).decode().split('\n')
+    return names, rows, columns, sources, header_size + layer_count * name_size + sources_size
+
+def is_outdated(level):
+    # the compiled file is a build cache, anything that does not match the current sources is rebuilt
+    path = compiled_level_path(level)
+    if not os.path.exists(path):
+        return True
+    header = read_header(path)
+    sources = existing_sources(level)
+    if header is None or header[3] != sources:
+        return True
+    compiled_time = os.path.getmtime(path)
+    for source in sources:
+        if os.path.getmtime(source) > compiled_time:
+            return True
+    return False
+
+def compile_level(level):
+    # layers come from the tiled map when there is one, the csv exports fill in whatever it lacks
+    layouts = {}
+    map_path = levels[level].get('map')
+    if map_path and os.path.exists(map_path):
+        map_layers = load_tmx(map_path)
+        layouts.update({name: layer for name, layer in map_layers.items() if name in layer_names})
+    for name in layer_names:
+        source = levels[level][name]
+        if name not in layouts and os.path.exists(source):
+            layouts[name] = np.array(import_csv_layout(source), dtype = '<i2')
+
+    # every layer shares the size of the terrain, missing layers are left empty
+    if 'terrain' not in layouts:
+        sources = [path for path in (map_path, levels[level]['terrain']) if path]
+        raise FileNotFoundError(f'Level {level} has no terrain layer, looked in {" and ".join(sources)}')
+    rows, columns = layouts['terrain'].shape
+    data = np.full((len(layer_names), rows, columns), -1, dtype = '<i2')
+    for index, name in enumerate(layer_names):
+        if name in layouts:
+            if layouts[name].shape != (rows, columns):
+                raise ValueError(f'Layer {name} of level {level} is {layouts[name].shape}, expected {(rows, columns)}')
+            data[index] = layouts[name]
+
+    os.makedirs(compiled_level_folder, exist_ok = True)
+    path = compiled_level_path(level)
+    # a temp file of its own, the preloader and the main thread can compile the same level at once
+    handle, temp_path = tempfile.mkstemp(suffix = '.tmp', dir = compiled_level_folder)
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            sources = '\n'.join(existing_sources(level)).encode()
+            file.write(struct.pack(header_format, magic, version, len(layer_names), rows, columns, len(sources)))
+            for name in layer_names:
+                file.write(name.encode().ljust(name_size, b'\0'))
+            file.write(sources)
+            file.write(data.tobytes())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def load_compiled_level(level):
+    if is_outdated(level):
+        compile_level(level)
+
+    path = compiled_level_path(level)
+    header = read_header(path)
+    if header is None:
+        raise ValueError(f'{path} is not a version {version} compiled level')
+    names, rows, columns, sources, offset = header
+    data = np.memmap(path, dtype = '<i2', mode = 'r', offset = offset, shape = (len(names), rows, columns))
+    return {name: data[index] for index, name in enumerate(names)}
+
+if __name__ == '__main__':
+    # run from the code folder: python compiled_level.py
+    for level in levels:
+        if os.path.exists(levels[level].get('map', '')) or os.path.exists(levels[level]['terrain']):
+            compile_level(level)
+            print(f'compiled level {level} -> {compiled_level_path(level)}')
+        else:
+            print(f'skipped level {level}, {levels[level]["terrain"]} not found')
@@ -0,0 +1,54 @@
+import pygame
+from settings import simulation_rate
+
+# stands in for pygame.key.get_pressed() while a script is driving the game
+class ScriptedKeys:
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+class Controls:
+    def __init__(self):
+        self.script = None
+        self.frame = 0
+        self.held = set()
+
+    def load_script(self, path):
+        # every line is '<frame> [key ...]', the keys are held from that frame until the next line
+        # key names are pygame's, with spaces written as underscores (left_shift)
+        script = []
+        with open(path) as file:
+            for line in file:
+                fields = line.split('#')[0].split()
+                if fields:
+                    script.append((int(fields[0]), fields[1:]))
+        self.set_script(script)
+
+    def set_script(self, script):
+        self.script = []
+        for frame, names in sorted(script, key = lambda step: step[0]):
+            keys = {pygame.key.key_code(name.replace('_', ' ')) for name in names}
+            self.script.append((frame, keys))
+        self.frame = 0
+        self.held = set()
+
+    def next_frame(self):
+        # called once per simulation step
+        if self.script is not None:
+            while self.script and self.script[0][0] <= self.frame:
+                self.held = self.script.pop(0)[1]
+        self.frame += 1
+
+    def get_ticks(self):
+        # game timers count simulation steps, so they agree with the fixed step movement
+        # and give the same result in scripted runs on any machine
+        return self.frame * 1000 // simulation_rate
+
+    def get_pressed(self):
+        if self.script is None:
+            return pygame.key.get_pressed()
+        return ScriptedKeys(self.held)
+
+controls = Controls()
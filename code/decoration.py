@@ -1,57 +1,61 @@
 import pygame
 from tiles import AnimatedTile, StaticTile
 from settings import vertical_lile_number, tile_size, screen_width
-from support import import_folder
+from support import import_folder, import_image
 from random import choice, randint
 
+# composed backdrops, shared by every Sky with the same horizon and style
+sky_surfaces = {}
+
 class Sky:
     def __init__(self, horizon, style = 'level'):
-        self.top = pygame.image.load('../graphics/decoration/sky/sky_top.png').convert()
-        self.bottom = pygame.image.load('../graphics/decoration/sky/sky_bottom.png').convert()
-        self.middle = pygame.image.load('../graphics/decoration/sky/sky_middle.png').convert()
         self.horizon = horizon
+        self.style = style
+
+        key = (self.horizon, self.style)
+        if key not in sky_surfaces:
+            sky_surfaces[key] = self.create_backdrop()
+        self.backdrop = sky_surfaces[key]
+
+    def create_backdrop(self):
+        top = import_image('../graphics/decoration/sky/sky_top.png', 'opaque')
+        bottom = import_image('../graphics/decoration/sky/sky_bottom.png', 'opaque')
+        middle = import_image('../graphics/decoration/sky/sky_middle.png', 'opaque')
 
         #stretch
-        self.top = pygame.transform.scale(self.top, (screen_width, tile_size))
-        self.bottom = pygame.transform.scale(self.bottom, (screen_width, tile_size))
-        self.middle = pygame.transform.scale(self.middle, (screen_width, tile_size)) 
+        top = pygame.transform.scale(top, (screen_width, tile_size))
+        bottom = pygame.transform.scale(bottom, (screen_width, tile_size))
+        middle = pygame.transform.scale(middle, (screen_width, tile_size))
+
+        backdrop = pygame.Surface((screen_width, vertical_lile_number * tile_size)).convert()
+        for row in range(vertical_lile_number):
+            y = row * tile_size
+            if row < self.horizon:
+                backdrop.blit(top, (0,y))
+            elif row == self.horizon:
+                backdrop.blit(middle, (0,y))
+            else:
+                backdrop.blit(bottom, (0,y))
 
-        self.style = style
         if self.style == 'overworld':
             palm_surfaces = import_folder('../graphics/overworld/palms')
-            self.palms = []
-            
             for surface in [choice(palm_surfaces) for image in range(10)]:
                 x = randint(0, screen_width)
                 y = (self.horizon * tile_size) + randint(50, 100)
                 rect = surface.get_rect(midbottom = (x, y))
-                self.palms.append((surface, rect))
-            
+                backdrop.blit(surface, rect)
+
             cloud_surfaces = import_folder('../graphics/overworld/clouds')
-            self.clouds = []
-            
             for surface in [choice(cloud_surfaces) for image in range(10)]:
                 x = randint(0, screen_width)
                 y = randint(0, (self.horizon * tile_size) - 100)
                 rect = surface.get_rect(midbottom = (x, y))
-                self.clouds.append((surface, rect))
+                backdrop.blit(surface, rect)
 
+        return backdrop
 
     def draw(self, surface):
-        for row in range(vertical_lile_number):
-            y = row * tile_size
-            if row < self.horizon:
-                surface.blit(self.top, (0,y))
-            elif row == self.horizon:
-                surface.blit(self.middle, (0,y))
-            else:
-                surface.blit(self.bottom, (0,y))
-        
-        if self.style == 'overworld':
-            for palm in self.palms:
-                surface.blit(palm[0], palm[1])
-            for cloud in self.clouds:
-                surface.blit(cloud[0], cloud[1])
+        surface.blit(self.backdrop, (0,0))
 
 class Water:
     def __init__(self, top, level_width):
@@ -63,12 +67,14 @@ class Water:
         for tile in range(tile_x_amount):
             x = tile * water_tile_width + water_start
             y = top
-            sprite = AnimatedTile(192, x, y, '../graphics/decoration/water')
+            sprite = AnimatedTile(192, x, y, 'water')
             self.water_sprites.add(sprite)
     
-    def draw(self, surface, shift):
-        self.water_sprites.update(shift)
-        self.water_sprites.draw(surface)
+    def update(self, camera):
+        camera.update(self.water_sprites)
+
+    def draw(self, camera):
+        camera.draw(self.water_sprites)
 
 class Clouds:
     def __init__(self, horizon, level_width, cloud_number):
@@ -86,6 +92,5 @@ class Clouds:
             sprite = StaticTile(0, x, y, cloud)
             self.cloud_sprites.add(sprite)
 
-    def draw(self, surface, shift):
-        self.cloud_sprites.update(shift)
-        self.cloud_sprites.draw(surface)
\ No newline at end of file
+    def draw(self, camera):
+        camera.draw(self.cloud_sprites)
\ No newline at end of file
@@ -0,0 +1,47 @@
+# dirty.py
+class DirtyTracker:
+    def __init__(self, surface, background):
+        self.display_surface = surface
+        self.background = background
+        self.full_redraw = True
+
+        # image and rect each sprite had when it was last drawn
+        self.drawn = {}
+
+    def draw(self, sprite_groups):
+        sprites = [sprite for group in sprite_groups for sprite in group]
+
+        # first frame: draw everything, the caller updates the whole display
+        if self.full_redraw:
+            self.full_redraw = False
+            self.display_surface.blit(self.background, (0,0))
+            for sprite in sprites:
+                self.display_surface.blit(sprite.image, sprite.rect)
+            self.drawn = {sprite: (sprite.image, sprite.rect.copy()) for sprite in sprites}
+            return None
+
+        dirty_rects = []
+        current = {}
+        for sprite in sprites:
+            image, rect = sprite.image, sprite.rect.copy()
+            current[sprite] = (image, rect)
+            previous = self.drawn.get(sprite)
+            if previous is None:
+                dirty_rects.append(rect)
+            elif previous[0] is not image or previous[1] != rect:
+                dirty_rects.append(previous[1])
+                dirty_rects.append(rect)
+        for sprite, previous in self.drawn.items():
+            if sprite not in current:
+                dirty_rects.append(previous[1])
+        self.drawn = current
+
+        # restore the background under each changed area and redraw whatever overlaps it
+        for rect in dirty_rects:
+            self.display_surface.set_clip(rect)
+            self.display_surface.blit(self.background, rect, rect)
+            for sprite in sprites:
+                if sprite.rect.colliderect(rect):
+                    self.display_surface.blit(sprite.image, sprite.rect)
+        self.display_surface.set_clip(None)
+        return dirty_rects
@@ -1,36 +1,174 @@
 import pygame
-from tiles import AnimatedTile
+import numpy as np
 from random import randint
+from settings import tile_size, view_margin
+from animation import import_clip
 
-class Enemy(AnimatedTile):
-    def __init__(self, size, x, y):
-        super().__init__(size, x, y, '../graphics/enemy/run')
-        self.rect.y += size - self.image.get_size()[1]
-        ## CHANGE : this speed is a random number between 3 and 5, increase or decrease to change difficulty
-        self.speed = randint(2, 8)
-        self.freeze_speed = 1
-        self.freeze_potion = False
-    
-    def freeze_speed_boost(self, start_time):
-        if self.freeze_potion:
-            current_time = pygame.time.get_ticks()
-            if current_time - start_time >= 3000:
-                self.freeze_potion = False
-                self.freeze_speed = 1
-                
-    
-    def move(self):
-        self.rect.x += self.speed * self.freeze_speed
-    
-    def reverse_image(self):
-        if self.speed > 0:
-            self.image = pygame.transform.flip(self.image, True, False)
-    
-    def reverse(self):
-        self.speed *= -1 * self.freeze_speed
-    
-    def update(self, shift):
-        self.rect.x += shift
-        self.animate()
-        self.move()
-        self.reverse_image()
+class Enemy(pygame.sprite.Sprite):
+    # draw sprite for one enemy on screen, the enemy itself lives in the EnemyManager arrays
+    def __init__(self, image):
+        super().__init__()
+        self.image = image
+        self.rect = pygame.Rect(0, 0, tile_size, tile_size)
+
+# bound for enemies with no constraint tile on one side
+far = 10 ** 12
+
+class PatrolIndex:
+    def __init__(self, constraint_layer):
+        # constraint tiles never move, so for every cell the nearest constraint column at or left of it
+        # and at or right of it is worked out once, -1 and columns mark a side without one
+        constraints = constraint_layer != -1
+        self.rows, self.columns = constraints.shape
+        columns = np.arange(self.columns)
+        self.left = np.maximum.accumulate(np.where(constraints, columns, -1), axis = 1)
+        self.right = np.minimum.accumulate(np.where(constraints, columns, self.columns)[:, ::-1], axis = 1)[:, ::-1]
+
+    def bounds(self, xs, ys):
+        # x range an enemy rect at (x, y) may cover without touching a constraint tile,
+        # taken from the gap around the enemy's center on both rows its rect overlaps
+        center = (xs + tile_size // 2) // tile_size
+        col = np.clip(center, 0, self.columns - 1)
+        left_bound = np.full(len(xs), -far, dtype = np.int64)
+        right_bound = np.full(len(xs), far, dtype = np.int64)
+        for row in (ys // tile_size, (ys + tile_size - 1) // tile_size):
+            inside = (row >= 0) & (row < self.rows)
+            left = np.full(len(xs), -1, dtype = np.int64)
+            right = np.full(len(xs), self.columns, dtype = np.int64)
+            left[inside] = self.left[row[inside], col[inside]]
+            right[inside] = self.right[row[inside], col[inside]]
+            # an enemy beyond the map edge has nothing on the outer side
+            left[center < 0] = -1
+            right[center >= self.columns] = self.columns
+            left_bound = np.maximum(left_bound, np.where(left >= 0, (left + 1) * tile_size, -far))
+            right_bound = np.minimum(right_bound, np.where(right < self.columns, right * tile_size, far))
+        return left_bound, right_bound
+
+class EnemyManager:
+    def __init__(self, layout, patrol_index):
+        self.clip = import_clip('enemy run')
+        self.frame_count = len(self.clip)
+        self.frame_speed = self.clip.speed
+        # enemy rects are a full tile, moved down so the image stands on the bottom of its cell
+        self.image_offset = tile_size - self.clip.frame(0).get_height()
+
+        # enemies turn around when they leave their patrol interval
+        self.patrol_index = patrol_index
+
+        # one entry per enemy in every array
+        self.x = np.zeros(0, dtype = np.int64)
+        self.y = np.zeros(0, dtype = np.int64)
+        self.previous_x = np.zeros(0, dtype = np.int64)
+        self.speed = np.zeros(0, dtype = np.int64)
+        self.freeze_speed = np.zeros(0, dtype = np.int64)
+        self.freeze_potion = np.zeros(0, dtype = bool)
+        self.frame_index = np.zeros(0, dtype = np.float64)
+        self.left_bound = np.zeros(0, dtype = np.int64)
+        self.right_bound = np.zeros(0, dtype = np.int64)
+        self.ids = np.zeros(0, dtype = np.int64)
+        self.next_id = 0
+        self.freeze_start_time = 0
+
+        # draw sprites of the enemies drawn last frame, by enemy id
+        self.sprites = {}
+        self.visible_sprites = pygame.sprite.Group()
+
+        self.add([col * tile_size for row, col, val in layout], [row * tile_size for row, col, val in layout])
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, xs, ys):
+        count = len(xs)
+        ## CHANGE : this speed is a random number between 2 and 8, increase or decrease to change difficulty
+        speeds = [randint(2, 8) for i in range(count)]
+        xs = np.array(xs, dtype = np.int64)
+        ys = np.array(ys, dtype = np.int64) + self.image_offset
+        left_bounds, right_bounds = self.patrol_index.bounds(xs, ys)
+        self.x = np.concatenate((self.x, xs))
+        self.y = np.concatenate((self.y, ys))
+        self.previous_x = np.concatenate((self.previous_x, xs))
+        self.speed = np.concatenate((self.speed, np.array(speeds, dtype = np.int64)))
+        self.freeze_speed = np.concatenate((self.freeze_speed, np.ones(count, dtype = np.int64)))
+        self.freeze_potion = np.concatenate((self.freeze_potion, np.zeros(count, dtype = bool)))
+        self.frame_index = np.concatenate((self.frame_index, np.zeros(count)))
+        self.left_bound = np.concatenate((self.left_bound, left_bounds))
+        self.right_bound = np.concatenate((self.right_bound, right_bounds))
+        self.ids = np.concatenate((self.ids, np.arange(self.next_id, self.next_id + count)))
+        self.next_id += count
+
+    def kill(self, indices):
+        indices = np.unique(indices)
+        self.x = np.delete(self.x, indices)
+        self.y = np.delete(self.y, indices)
+        self.previous_x = np.delete(self.previous_x, indices)
+        self.speed = np.delete(self.speed, indices)
+        self.freeze_speed = np.delete(self.freeze_speed, indices)
+        self.freeze_potion = np.delete(self.freeze_potion, indices)
+        self.frame_index = np.delete(self.frame_index, indices)
+        self.left_bound = np.delete(self.left_bound, indices)
+        self.right_bound = np.delete(self.right_bound, indices)
+        self.ids = np.delete(self.ids, indices)
+
+    def rect(self, index):
+        return pygame.Rect(int(self.x[index]), int(self.y[index]), tile_size, tile_size)
+
+    def collide(self, rect):
+        # indices of the enemies overlapping rect
+        x, y = self.x, self.y
+        hits = (x < rect.right) & (x + tile_size > rect.left) & (y < rect.bottom) & (y + tile_size > rect.top)
+        return np.flatnonzero(hits)
+
+    def freeze(self, current_time):
+        self.freeze_start_time = current_time
+        self.freeze_potion[:] = True
+        self.freeze_speed[:] = 0
+
+    def stop(self):
+        self.freeze_speed[:] = 0
+
+    def update(self, current_time):
+        # one simulation step for every enemy: animate, move, turn around at the patrol bounds, thaw
+        self.previous_x = self.x.copy()
+
+        self.frame_index += self.frame_speed
+        self.frame_index[self.frame_index >= self.frame_count] = 0
+
+        self.x += self.speed * self.freeze_speed
+
+        # past a bound the rect overlaps the constraint tile, which is where the enemy turns around
+        touching = (self.x < self.left_bound) | (self.x + tile_size > self.right_bound)
+        self.speed[touching] *= -self.freeze_speed[touching]
+
+        if self.freeze_start_time != 0 and current_time - self.freeze_start_time >= 3000:
+            self.freeze_speed[self.freeze_potion] = 1
+            self.freeze_potion[:] = False
+
+    def draw(self, camera):
+        # draw sprites are only made for enemies on screen, between their last two positions
+        if camera.alpha == 1:
+            x = self.x
+        else:
+            x = (self.previous_x + (self.x - self.previous_x) * camera.alpha).astype(np.int64)
+        left = int(camera.draw_offset.x) - view_margin
+        top = int(camera.draw_offset.y) - view_margin
+        right = left + camera.view.width
+        bottom = top + camera.view.height
+        visible = np.flatnonzero((x < right) & (x + tile_size > left) & (self.y < bottom) & (self.y + tile_size > top))
+
+        sprites = {}
+        for index in visible.tolist():
+            enemy_id = int(self.ids[index])
+            image = self.clip.frame(self.frame_index[index], self.speed[index] > 0)
+            sprite = self.sprites.get(enemy_id)
+            if sprite is None:
+                sprite = Enemy(image)
+            sprite.image = image
+            sprite.rect.topleft = (int(x[index]), int(self.y[index]))
+            sprites[enemy_id] = sprite
+        self.sprites = sprites
+        self.visible_sprites.empty()
+        self.visible_sprites.add(*sprites.values())
+        camera.draw(self.visible_sprites)
+        # the enemies off screen count towards the total as well
+        camera.total_sprites += len(self) - len(self.visible_sprites)
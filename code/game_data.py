@@ -10,6 +10,7 @@ level_0 = {
     'grass': '../levels/0/level_0_grass.csv',
     'jump_boost': '../levels/0/level_0_jump_boost.csv',
     'transport': '../levels/0/level_0_transport.csv',
+    'map': '../levels/level_data/level_0.tmx',
     'node_pos': (110, 400),
     'unlock': 1,
     'node_graphics': '../graphics/overworld/0'
@@ -25,8 +26,9 @@ level_1 = {
     'constraints': '../levels/1/level_1_constraints.csv',
     'player': '../levels/1/level_1_player.csv',
     'grass': '../levels/1/level_1_grass.csv',
-    'jump_boost': '../levels/0/level_1_jump_boost.csv',
-    'transport': '../levels/0/level_1_transport.csv',
+    'jump_boost': '../levels/1/level_1_jump_boost.csv',
+    'transport': '../levels/1/level_1_transport.csv',
+    'map': '../levels/level_data/level_1.tmx',
     'node_pos': (300, 220),
     'unlock': 2,
     'node_graphics': '../graphics/overworld/1'
@@ -42,8 +44,8 @@ level_2 = {
     'constraints': '../levels/2/level_2_constraints.csv',
     'player': '../levels/2/level_2_player.csv',
     'grass': '../levels/2/level_2_grass.csv',
-    'jump_boost': '../levels/0/level_2_jump_boost.csv',
-    'transport': '../levels/0/level_2_transport.csv',
+    'jump_boost': '../levels/2/level_2_jump_boost.csv',
+    'transport': '../levels/2/level_2_transport.csv',
     'node_pos': (480, 610),
     'unlock': 3,
     'node_graphics': '../graphics/overworld/2'
@@ -59,8 +61,8 @@ level_3 = {
     'constraints': '../levels/3/level_3_constraints.csv',
     'player': '../levels/3/level_3_player.csv',
     'grass': '../levels/3/level_3_grass.csv',
-    'jump_boost': '../levels/0/level_3_jump_boost.csv',
-    'transport': '../levels/0/level_3_transport.csv',
+    'jump_boost': '../levels/3/level_3_jump_boost.csv',
+    'transport': '../levels/3/level_3_transport.csv',
     'node_pos': (610, 350),
     'unlock': 4,
     'node_graphics': '../graphics/overworld/3'
@@ -76,8 +78,8 @@ level_4 = {
     'constraints': '../levels/4/level_4_constraints.csv',
     'player': '../levels/4/level_4_player.csv',
     'grass': '../levels/4/level_4_grass.csv',
-    'jump_boost': '../levels/0/level_4_jump_boost.csv',
-    'transport': '../levels/0/level_4_transport.csv',
+    'jump_boost': '../levels/4/level_4_jump_boost.csv',
+    'transport': '../levels/4/level_4_transport.csv',
     'node_pos': (880, 210),
     'unlock': 5,
     'node_graphics': '../graphics/overworld/4'
@@ -93,8 +95,8 @@ level_5 = {
     'constraints': '../levels/5/level_5_constraints.csv',
     'player': '../levels/5/level_5_player.csv',
     'grass': '../levels/5/level_5_grass.csv',
-    'jump_boost': '../levels/0/level_5_jump_boost.csv',
-    'transport': '../levels/0/level_5_transport.csv',
+    'jump_boost': '../levels/5/level_5_jump_boost.csv',
+    'transport': '../levels/5/level_5_transport.csv',
     'node_pos': (1050, 400),
     'unlock': 5,
     'node_graphics': '../graphics/overworld/5'
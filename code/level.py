@@ -3,34 +3,60 @@
 import pygame
 from tiles import Tile, StaticTile, Crate, Coin, Palm, Heart
 from decoration import Sky, Water, Clouds
-from enemy import Enemy
-from settings import tile_size, screen_width, screen_height
+from enemy import EnemyManager, PatrolIndex
+from settings import tile_size, screen_height, loading_frame_budget, loading_batch_size, loading_fixed_steps, dust_particle_slots, explosion_particle_slots
 from player import Player
-from particles import ParticleEffect
-from support import import_csv_layout, import_cut_graphics
+from particles import ParticlePool
+from support import import_tileset, import_image
+from preload import level_preloader
+from controls import controls
+from profiler import profiler
+from audio import audio
 from player import Player, Dragon
-from particles import ParticleEffect
 from game_data import levels
 from random import randint
+from time import perf_counter
 from shop import ItemManager
+from camera import Camera
+from spatial import SolidGrid, SpatialGroup
+from chunks import ChunkLayer
 
 class Level:
-    def __init__(self, current_level, surface, create_overworld, change_coins, change_health, owned_items):
+    def __init__(self, current_level, surface, create_overworld, change_coins, change_health, owned_items, tile_map = None):
 
         #general setup
         self.display_surface = surface
-        self.world_shift = 0
-        self.current_x = None
-
-        # audio
-        self.coin_sound = pygame.mixer.Sound('../audio/effects/coin.wav')
-        self.stomp_sound = pygame.mixer.Sound('../audio/effects/stomp.wav')
+        self.camera = Camera(self.display_surface)
 
         #overworld connection
         self.create_overworld = create_overworld
         self.current_level = current_level
+
+        #user interface
+        self.change_coins = change_coins
+        self.change_health = change_health
+        self.owned_items = owned_items
+
+        # a tile map can be passed in instead of loading the level's own (used by the benchmarks)
+        self.tile_map = tile_map
+
+        # construction runs in steps, see build and load
+        self.loader = self.build()
+        self.loaded = False
+        self.load_units_done = 0
+        self.load_units_total = 1
+        self.longest_load_step = 0
+
+    def build(self):
+        # the preloader may still be working on this level in the background
+        if self.tile_map is None:
+            while level_preloader.is_preparing(self.current_level):
+                yield
+            self.tile_map = level_preloader.get_tile_map(self.current_level)
         level_data = levels[self.current_level]
         self.new_max_level = level_data['unlock']
+        self.load_units_total = sum(self.tile_map.count(name) for name in self.tile_map.layers) + loading_fixed_steps
+        yield
 
         # projectiles
         self.projectiles = pygame.sprite.GroupSingle()
@@ -40,161 +66,196 @@ class Level:
         self.active_player = 'player'
 
         #player
-        player_layout = import_csv_layout(level_data['player'])
+        player_layout = self.tile_map.cells('player')
         self.player = pygame.sprite.GroupSingle()
         self.goal = pygame.sprite.GroupSingle()
-        self.player_setup(player_layout, change_health)
+        self.player_setup(player_layout, self.change_health)
 
         #transport sprites
-        self.transport_layout = import_csv_layout(level_data['transport'])
+        self.transport_layout = self.tile_map.cells('transport')
         self.dragon = pygame.sprite.GroupSingle()
-        self.change_health = change_health
         self.dragon_created = False
         self.dragon_x, self.dragon_y = self.get_dragon_starting_position(self.transport_layout)
         #self.dragon_setup(transport_layout, change_health)
 
-        #user interface
-        self.change_coins = change_coins
-        self.change_health = change_health
-
         #dust
-        self.dust_sprite = pygame.sprite.GroupSingle()
+        self.dust_particles = ParticlePool(dust_particle_slots)
         self.player_on_ground = False
 
         #explosion particles
-        self.explosion_sprites = pygame.sprite.Group()
+        self.explosion_particles = ParticlePool(explosion_particle_slots)
+        self.load_units_done += 1
+        yield
 
         #terrain setup
-        terrain_layout = import_csv_layout(level_data['terrain'])
-        self.terrain_sprites = self.create_tile_group(terrain_layout, 'terrain')
+        terrain_layout = self.tile_map.cells('terrain')
+        self.terrain_sprites = yield from self.create_tile_group(terrain_layout, 'terrain')
+        self.terrain_layer = ChunkLayer(self.terrain_sprites)
 
         #grass setup
-        grass_layout = import_csv_layout(level_data['grass'])
-        self.grass_sprites = self.create_tile_group(grass_layout, 'grass')
+        grass_layout = self.tile_map.cells('grass')
+        self.grass_sprites = yield from self.create_tile_group(grass_layout, 'grass')
+        self.grass_layer = ChunkLayer(self.grass_sprites)
 
         #crates setup
-        crate_layout = import_csv_layout(level_data['crates'])
-        self.crate_sprites = self.create_tile_group(crate_layout, 'crates')
+        crate_layout = self.tile_map.cells('crates')
+        self.crate_sprites = yield from self.create_tile_group(crate_layout, 'crates')
 
         #coins
-        coin_layout = import_csv_layout(level_data['coins'])
-        self.coin_sprites = self.create_tile_group(coin_layout, 'coins')
+        coin_layout = self.tile_map.cells('coins')
+        self.coin_sprites = yield from self.create_tile_group(coin_layout, 'coins')
 
         #foreground palms
-        fg_palm_layout = import_csv_layout(level_data['fg palms'])
-        self.fg_palm_sprites = self.create_tile_group(fg_palm_layout, 'fg palms')
+        fg_palm_layout = self.tile_map.cells('fg palms')
+        self.fg_palm_sprites = yield from self.create_tile_group(fg_palm_layout, 'fg palms')
 
         #background palms
-        bg_palm_layout = import_csv_layout(level_data['bg palms'])
-        self.bg_palm_sprites = self.create_tile_group(bg_palm_layout, 'bg palms')
-
-        # enemy
-        enemy_layout = import_csv_layout(level_data['enemies'])
-        self.enemy_sprites = self.create_tile_group(enemy_layout, 'enemies')
-
-        # constraint
-        constraint_layout = import_csv_layout(level_data['constraints'])
-        self.constraint_sprites = self.create_tile_group(constraint_layout, 'constraint')
+        bg_palm_layout = self.tile_map.cells('bg palms')
+        self.bg_palm_sprites = yield from self.create_tile_group(bg_palm_layout, 'bg palms')
+
+        #solid tiles for player collision
+        self.solid_grid = SolidGrid(self.tile_map.columns, self.tile_map.rows)
+        self.solid_grid.add_group(self.terrain_sprites)
+        self.solid_grid.add_group(self.crate_sprites)
+        self.solid_grid.add_group(self.fg_palm_sprites)
+        self.load_units_done += 1
+        yield
+
+        # enemy, patrolling between the constraint tiles
+        enemy_layout = self.tile_map.cells('enemies')
+        self.patrol_index = PatrolIndex(self.tile_map.layer('constraints'))
+        self.enemies = EnemyManager(enemy_layout, self.patrol_index)
+        self.load_units_done += len(enemy_layout) + self.tile_map.count('constraints')
 
         # jump boost platforms
-        jump_boost_platforms_layout = import_csv_layout(level_data['jump_boost'])
-        self.jump_boost_sprites = self.create_tile_group(jump_boost_platforms_layout, 'jump_boost')
+        jump_boost_platforms_layout = self.tile_map.cells('jump_boost')
+        self.jump_boost_sprites = yield from self.create_tile_group(jump_boost_platforms_layout, 'jump_boost')
 
         #decoration
         self.sky = Sky(8)
-        level_width = len(terrain_layout[0]) * tile_size
+        self.load_units_done += 1
+        yield
+        level_width = self.tile_map.width
         self.water = Water(screen_height - 25, level_width)
+        self.load_units_done += 1
+        yield
         self.clouds = Clouds(400, level_width, 30)
+        self.load_units_done += 1
+        yield
 
         # hearts 
-        self.heart_sprites = pygame.sprite.Group()
+        self.heart_sprites = SpatialGroup()
 
         # items
-        self.owned_items = owned_items
         self.item_manager = ItemManager(self.display_surface, self.owned_items)
         self.invincibility_potion = False
         self.invincibility_boost_start_time = 0
         self.running_speed_boost_start_time = 0
         self.gravity_boost_start_time = 0
-        self.freeze_start_time = 0
+        self.load_units_done = self.load_units_total
+
+    def load(self, time_budget = loading_frame_budget):
+        # runs construction steps while the next one is expected to fit in the time budget (ms)
+        # returns True once the level is ready
+        start_time = perf_counter()
+        while True:
+            step_start_time = perf_counter()
+            try:
+                next(self.loader)
+            except StopIteration:
+                self.loaded = True
+                return True
+            current_time = perf_counter()
+            self.longest_load_step = max(self.longest_load_step, current_time - step_start_time)
+            if (current_time - start_time + self.longest_load_step) * 1000 >= time_budget:
+                return False
+
+    def finish_loading(self):
+        for step in self.loader:
+            pass
+        self.loaded = True
+
+    def load_progress(self):
+        return min(self.load_units_done / self.load_units_total, 1)
     
     def create_tile_group(self, layout, type):
-        sprite_group = pygame.sprite.Group()
-        for row_index, row in enumerate(layout):
-            for col_index, val in enumerate(row):
-                if val != '-1':
-                    x = col_index * tile_size
-                    y = row_index * tile_size
-
-                    if type == 'terrain':
-                        terrain_tile_list = import_cut_graphics('../graphics/terrain/terrain_tiles.png')
-                        tile_surface = terrain_tile_list[int(val)]
-                        sprite = StaticTile(tile_size, x, y, tile_surface)
-                    if type == 'grass':
-                        grass_tile_list = import_cut_graphics('../graphics/decoration/grass/grass.png')
-                        tile_surface = grass_tile_list[int(val)]
-                        sprite = StaticTile(tile_size, x, y, tile_surface)
-                    if type == 'crates':
-                        sprite = Crate(tile_size, x, y)
-                    if type == 'coins':
-                        if val == '0': sprite = Coin(tile_size, x, y, '../graphics/coins/gold', 5)
-                        if val == '1': sprite = Coin(tile_size, x, y, '../graphics/coins/silver', 1)
-                    if type == 'fg palms':
-                        if val == '0': sprite = Palm(tile_size, x, y, '../graphics/terrain/palm_small', 38)
-                        if val == '1': sprite = Palm(tile_size, x, y, '../graphics/terrain/palm_large', 64)
-                    if type == 'bg palms':
-                        sprite = Palm(tile_size, x, y, '../graphics/terrain/palm_bg', 38)
-                    if type == 'enemies':
-                        sprite = Enemy(tile_size, x, y)
-                    if type == 'constraint':
-                        sprite = Tile(tile_size, x, y)
-                    if type == 'jump_boost':
-                        sprite = Tile(tile_size, x, y)
-                    try:
-                        sprite_group.add(sprite)
-                    except:
-                        print(f'No tile of type {type} found in layout.')
+        # generator: yields every few sprites so loading can be spread over frames, returns the group
+        if type in ('crates', 'coins'):
+            sprite_group = SpatialGroup()
+        else:
+            sprite_group = pygame.sprite.Group()
+        if type == 'terrain':
+            terrain_tile_list = import_tileset('../graphics/terrain/terrain_tiles.png')
+        if type == 'grass':
+            grass_tile_list = import_tileset('../graphics/decoration/grass/grass.png')
+
+        for row_index, col_index, val in layout:
+            x = col_index * tile_size
+            y = row_index * tile_size
+
+            if type == 'terrain':
+                tile_surface = terrain_tile_list[val]
+                sprite = StaticTile(tile_size, x, y, tile_surface)
+            if type == 'grass':
+                tile_surface = grass_tile_list[val]
+                sprite = StaticTile(tile_size, x, y, tile_surface)
+            if type == 'crates':
+                sprite = Crate(tile_size, x, y)
+            if type == 'coins':
+                if val == 0: sprite = Coin(tile_size, x, y, 'gold coin', 5)
+                if val == 1: sprite = Coin(tile_size, x, y, 'silver coin', 1)
+            if type == 'fg palms':
+                if val == 0: sprite = Palm(tile_size, x, y, 'palm small', 38)
+                if val == 1: sprite = Palm(tile_size, x, y, 'palm large', 64)
+            if type == 'bg palms':
+                sprite = Palm(tile_size, x, y, 'palm bg', 38)
+            if type == 'jump_boost':
+                sprite = Tile(tile_size, x, y)
+            try:
+                sprite_group.add(sprite)
+            except:
+                print(f'No tile of type {type} found in layout.')
+
+            self.load_units_done += 1
+            if self.load_units_done % loading_batch_size == 0:
+                yield
         return sprite_group
     
     def player_setup(self, layout, change_health):
-        for row_index, row in enumerate(layout):
-            for col_index, val in enumerate(row):
-                x = col_index * tile_size
-                y = row_index * tile_size
-                if val == '0':
-                    sprite = Player((x, y), self.display_surface, self.create_jump_particles, change_health)
-                    projectile_sprite = sprite.projectile.sprite
-                    self.projectiles.add(projectile_sprite)
-                    self.player.add(sprite)
-                if val == '1':
-                    hat_surface = pygame.image.load('../graphics/character/hat.png').convert_alpha()
-                    sprite = StaticTile(tile_size, x, y, hat_surface)
-                    self.goal.add(sprite)
+        for row_index, col_index, val in layout:
+            x = col_index * tile_size
+            y = row_index * tile_size
+            if val == 0:
+                sprite = Player((x, y), self.display_surface, self.create_jump_particles, change_health, self.camera)
+                projectile_sprite = sprite.projectile.sprite
+                self.projectiles.add(projectile_sprite)
+                self.player.add(sprite)
+            if val == 1:
+                hat_surface = import_image('../graphics/character/hat.png')
+                sprite = StaticTile(tile_size, x, y, hat_surface)
+                self.goal.add(sprite)
 
     def dragon_setup(self, layout, change_health):
-        for row_index, row in enumerate(layout):
-            for col_index, val in enumerate(row):
-                x = col_index * tile_size
-                y = row_index * tile_size
-                if val == '0':
-                    #sprite = Player((x, y), self.display_surface, self.create_jump_particles, change_health)
-                    sprite = Dragon((x, y), self.display_surface, change_health)
-                    self.dragon.add(sprite)
-                    projectile_sprite = sprite.projectile.sprite
-                    self.dragon_projectiles.add(projectile_sprite)
-                if val == '1':
-                    hat_surface = pygame.image.load('../graphics/character/hat.png').convert_alpha()
-                    sprite = StaticTile(tile_size, x, y, hat_surface)
-                    self.goal.add(sprite)
+        for row_index, col_index, val in layout:
+            x = col_index * tile_size
+            y = row_index * tile_size
+            if val == 0:
+                #sprite = Player((x, y), self.display_surface, self.create_jump_particles, change_health)
+                sprite = Dragon((x, y), self.display_surface, change_health, self.camera)
+                self.dragon.add(sprite)
+                projectile_sprite = sprite.projectile.sprite
+                self.dragon_projectiles.add(projectile_sprite)
+            if val == 1:
+                hat_surface = import_image('../graphics/character/hat.png')
+                sprite = StaticTile(tile_size, x, y, hat_surface)
+                self.goal.add(sprite)
     
     def get_dragon_starting_position(self, layout):
-        for row_index, row in enumerate(layout):
-            for col_index, val in enumerate(row):
-                x = col_index * tile_size
-                y = row_index * tile_size
-                if val == '0':
-                    dragon_position_x = x
-                    dragon_position_y = y
+        dragon_position_x, dragon_position_y = 0, 0
+        for row_index, col_index, val in layout:
+            if val == 0:
+                dragon_position_x = col_index * tile_size
+                dragon_position_y = row_index * tile_size
         return dragon_position_x, dragon_position_y
 
     def jump_boost_platform(self):
@@ -205,18 +266,12 @@ class Level:
             pass
             #self.player.sprite.set_default_jump()
     
-    def enemy_collision_reverse(self):
-        for enemy in self.enemy_sprites.sprites():
-            if pygame.sprite.spritecollide(enemy, self.constraint_sprites, False):
-                enemy.reverse()
-
     def create_jump_particles(self, pos):
+        x, y = pos
         if self.player.sprite.facing_right:
-            pos -= pygame.math.Vector2(10,5)
+            self.dust_particles.spawn('jump', x - 10, y - 5)
         else:
-            pos += pygame.math.Vector2(10,5)
-        jump_particle_sprite = ParticleEffect(pos, 'jump')
-        self.dust_sprite.add(jump_particle_sprite)
+            self.dust_particles.spawn('jump', x + 10, y + 5)
     
     def horizontal_movement_collision(self):
         if self.active_player == 'player':
@@ -226,9 +281,7 @@ class Level:
 
         player.collision_rect.x += player.direction.x * player.speed
 
-        collidable_sprites = self.terrain_sprites.sprites() + self.crate_sprites.sprites() + self.fg_palm_sprites.sprites()
-
-        for sprite in collidable_sprites:
+        for sprite in self.solid_grid.collide(player.collision_rect):
             if sprite.rect.colliderect(player.collision_rect):
                 if player.direction.x < 0:
                     player.collision_rect.left = sprite.rect.right
@@ -245,7 +298,6 @@ class Level:
             player = self.dragon.sprite
             player.collision_rect.y += player.direction.y * player.speed
 
-        collidable_sprites = self.terrain_sprites.sprites() + self.crate_sprites.sprites() + self.fg_palm_sprites.sprites()
         jump_boost_sprites = self.jump_boost_sprites.sprites()
 
         if self.active_player == 'player':
@@ -257,7 +309,7 @@ class Level:
                         player.on_ground = True
                         player.set_jump_boost()
 
-        for sprite in collidable_sprites:
+        for sprite in self.solid_grid.collide(player.collision_rect):
             if sprite.rect.colliderect(player.collision_rect):
                 if player.direction.y > 0:
                     player.collision_rect.bottom = sprite.rect.top
@@ -277,7 +329,6 @@ class Level:
                 player.on_dragon = True
                 self.dragon.sprite.active = True
                 self.active_player = 'dragon'
-                print("IM ON THE DRAGON")
 
         if player.on_ground and player.direction.y < 0 or player.direction.y > 1:
             player.on_ground = False
@@ -287,18 +338,8 @@ class Level:
             player = self.player.sprite
         elif self.active_player == 'dragon':
             player = self.dragon.sprite
-        player_x = player.rect.centerx
-        direction_x = player.direction.x
-
-        if player_x < screen_width / 4 and direction_x < 0:
-            self.world_shift = 8 + player.boost_speed
-            player.speed = 0
-        elif player_x > screen_width - (screen_width / 4) and direction_x > 0:
-            self.world_shift = -8 - player.boost_speed
-            player.speed = 0
-        else:
-            self.world_shift = 0
-            player.speed = 8 + player.boost_speed
+        player.speed = 8 + player.boost_speed
+        self.camera.follow(player.rect, player.direction.x)
 
     def get_player_on_ground(self):
         if self.player.sprite.on_ground:
@@ -307,13 +348,9 @@ class Level:
             self.player_on_ground = False
     
     def create_landing_dust(self):
-        if not self.player_on_ground and self.player.sprite.on_ground and not self.dust_sprite.sprites():
-            if self.player.sprite.facing_right:
-                offset = pygame.math.Vector2(10, 15)
-            else:
-                offset = pygame.math.Vector2(10, 15)
-            fall_dust_particle = ParticleEffect(self.player.sprite.rect.midbottom - offset, 'land')
-            self.dust_sprite.add(fall_dust_particle)
+        if not self.player_on_ground and self.player.sprite.on_ground and not self.dust_particles:
+            x, y = self.player.sprite.rect.midbottom
+            self.dust_particles.spawn('land', x - 10, y - 15)
 
     def check_death(self):
         if self.player.sprite.rect.top > screen_height:
@@ -328,9 +365,9 @@ class Level:
             player = self.player.sprite
         elif self.active_player == 'dragon':
             player = self.dragon.sprite
-        collided_coins = pygame.sprite.spritecollide(player, self.coin_sprites, True)
+        collided_coins = self.coin_sprites.collide(player, True)
         if collided_coins:
-            self.coin_sound.play()
+            audio.play('coin')
             for coin in collided_coins:
                 self.change_coins(coin.value)
 
@@ -339,85 +376,82 @@ class Level:
             player = self.player.sprite
         elif self.active_player == 'dragon':
             player = self.dragon.sprite
-        collided_hearts = pygame.sprite.spritecollide(player, self.heart_sprites, True)
+        collided_hearts = self.heart_sprites.collide(player, True)
         if collided_hearts:
             for heart in collided_hearts:
                 self.change_health(heart.value)
     
     def check_loot_crate(self):
         if self.active_player == 'player':    
-            fireball_collisions = pygame.sprite.spritecollide(self.projectiles.sprite, self.crate_sprites, False)
+            fireball_collisions = self.crate_sprites.collide(self.projectiles.sprite)
             player = self.player.sprite
         elif self.active_player == 'dragon':
-            fireball_collisions = pygame.sprite.spritecollide(self.dragon_projectiles.sprite, self.crate_sprites, False)
+            fireball_collisions = self.crate_sprites.collide(self.dragon_projectiles.sprite)
             player = self.dragon.sprite
         if fireball_collisions and player.shot is True:
             for crate in fireball_collisions:
-                explosion_sprite = ParticleEffect(crate.rect.center, 'explosion')
-                print(f"Crate Center: {crate.rect.center}")
-                self.explosion_sprites.add(explosion_sprite)
+                self.explosion_particles.spawn('explosion', *crate.rect.center)
                 self.player.sprite.shot = False
                 self.add_random_sprite(crate.rect.centerx, crate.y)
+                self.solid_grid.remove(crate)
                 crate.kill()
     
     def add_random_sprite(self, x, y):
         random_choice = randint(0, 2)
 
         if random_choice == 0:
-            new_coin_sprite = Coin(tile_size, x, y, '../graphics/coins/gold', 5)
+            new_coin_sprite = Coin(tile_size, x, y, 'gold coin', 5)
             self.coin_sprites.add(new_coin_sprite)
         elif random_choice == 1:
-            new_enemy_sprite = Enemy(tile_size, x, y)
-            self.enemy_sprites.add(new_enemy_sprite)
+            self.enemies.add([x], [y])
         elif random_choice == 2:
             new_heart_sprite = Heart(tile_size, x, y, 10)
             self.heart_sprites.add(new_heart_sprite)
         #This one is for you Kai, just change the code to at the top of this function to  random_choice = 3
         elif random_choice == 3:
             #Change the number in range( ) to a bigger one for more enemies, keep it reasonable though, otherwise the game might crash
-            for i in range(25):
-                new_enemy_sprite = Enemy(tile_size, x, y)
-                self.enemy_sprites.add(new_enemy_sprite)
+            self.enemies.add([x] * 25, [y] * 25)
 
     def check_enemy_collisions(self):
         if self.active_player == 'player':    
-            enemy_collisions = pygame.sprite.spritecollide(self.player.sprite, self.enemy_sprites, False)
-            fireball_collisions = pygame.sprite.spritecollide(self.projectiles.sprite, self.enemy_sprites, False)
+            enemy_collisions = self.enemies.collide(self.player.sprite.rect)
+            fireball_collisions = self.enemies.collide(self.projectiles.sprite.rect)
             player = self.player.sprite
         elif self.active_player == 'dragon':
-            enemy_collisions = pygame.sprite.spritecollide(self.dragon.sprite, self.enemy_sprites, False)
-            fireball_collisions = pygame.sprite.spritecollide(self.dragon_projectiles.sprite, self.enemy_sprites, False)
+            enemy_collisions = self.enemies.collide(self.dragon.sprite.rect)
+            fireball_collisions = self.enemies.collide(self.dragon_projectiles.sprite.rect)
             player = self.dragon.sprite
 
-        if enemy_collisions:
-            for enemy in enemy_collisions:
-                enemy_center = enemy.rect.centery
-                enemy_top = enemy.rect.top
-                player_bottom = self.player.sprite.rect.bottom
-                if enemy_top < player_bottom < enemy_center and self.player.sprite.direction.y >= 0:
-                    self.stomp_sound.play()
-                    self.player.sprite.direction.y = -15
-                    explosion_sprite = ParticleEffect(enemy.rect.center, 'explosion')
-                    self.explosion_sprites.add(explosion_sprite)
-                    enemy.kill()
-                else:
-                    if not self.player.sprite.invincibility_potion:
-                        self.player.sprite.get_damage()
-                    if self.dragon_created:
-                        if not self.dragon.sprite.invincible:
-                            print("Get damage dragon")
-                            self.dragon.sprite.get_damage()
+        killed = []
+        for index in enemy_collisions:
+            enemy_rect = self.enemies.rect(index)
+            enemy_center = enemy_rect.centery
+            enemy_top = enemy_rect.top
+            player_bottom = self.player.sprite.rect.bottom
+            if enemy_top < player_bottom < enemy_center and self.player.sprite.direction.y >= 0:
+                audio.play('stomp')
+                self.player.sprite.direction.y = -15
+                self.explosion_particles.spawn('explosion', *enemy_rect.center)
+                killed.append(index)
+            else:
+                if not self.player.sprite.invincibility_potion:
+                    self.player.sprite.get_damage()
+                if self.dragon_created:
+                    if not self.dragon.sprite.invincible:
+                        self.dragon.sprite.get_damage()
         
-        if fireball_collisions and player.shot is True:
-            for enemy in fireball_collisions:
-                self.stomp_sound.play()
-                explosion_sprite = ParticleEffect(enemy.rect.center, 'explosion')
-                self.explosion_sprites.add(explosion_sprite)
-                enemy.kill()
+        if len(fireball_collisions) and player.shot is True:
+            for index in fireball_collisions:
+                audio.play('stomp')
+                self.explosion_particles.spawn('explosion', *self.enemies.rect(index).center)
+                killed.append(index)
                 self.player.sprite.shot = False
 
+        if killed:
+            self.enemies.kill(killed)
+
     def get_input(self):
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
 
         if self.active_player == 'dragon' and keys[pygame.K_SPACE]:
             self.active_player = 'player'
@@ -444,8 +478,7 @@ class Level:
             if keys[pygame.K_6] and self.item_manager.owned_items[5] != None:
                 self.apply_powerup(self.item_manager.owned_items[5])
                 self.owned_items = self.item_manager.remove_item(5)
-                for enemy in self.enemy_sprites.sprites():
-                    enemy.freeze_speed = 0
+                self.enemies.stop()
         except IndexError:
             pass
     
@@ -453,24 +486,21 @@ class Level:
         if item_path.endswith("rocket_boots.png"):
             self.player.sprite.gravity_potion = True
             self.player.sprite.gravity = 0.4
-            self.gravity_boost_start_time = pygame.time.get_ticks()
+            self.gravity_boost_start_time = controls.get_ticks()
         if item_path.endswith("light_blue_potion.png"):
-            self.freeze_start_time = pygame.time.get_ticks()
-            for enemy in self.enemy_sprites.sprites():
-                enemy.freeze_potion = True
-                enemy.freeze_speed = 0
+            self.enemies.freeze(controls.get_ticks())
         if item_path.endswith("red_potion.png"):
             self.player.sprite.invincible = True
             self.player.sprite.invincibility_potion = True
-            self.invincibility_boost_start_time = pygame.time.get_ticks()
+            self.invincibility_boost_start_time = controls.get_ticks()
         if item_path.endswith("watermelon.png"):
             self.change_health(10)
         if item_path.endswith("dark_blue_potion.png"):
             self.player.sprite.boost_speed = 8
             self.player.sprite.running_speed_potion = True
-            self.running_speed_boost_start_time = pygame.time.get_ticks()
+            self.running_speed_boost_start_time = controls.get_ticks()
         if item_path.endswith("teal_potion.png"):
-            sprite = Dragon((self.dragon_x, self.dragon_y), self.display_surface, self.change_health)
+            sprite = Dragon((self.dragon_x, self.dragon_y), self.display_surface, self.change_health, self.camera)
             self.dragon.add(sprite)
             projectile_sprite = sprite.projectile.sprite
             self.dragon_projectiles.add(projectile_sprite)
@@ -481,89 +511,127 @@ class Level:
             self.player.sprite.rect.centerx = self.dragon.sprite.rect.centerx
             self.player.sprite.rect.centery = self.dragon.sprite.rect.centery - 30
 
-    def run(self):
+    def update(self):
+        # one fixed simulation step
+        if not self.loaded:
+            self.finish_loading()
+
+        self.camera.begin_step([self.player, self.dragon, self.projectiles, self.dragon_projectiles])
+
         #decoration
-        self.sky.draw(self.display_surface)
-        self.clouds.draw(self.display_surface, self.world_shift)
+        with profiler.section('decoration'):
+            self.camera.update(self.bg_palm_sprites)
+            self.camera.update(self.coin_sprites)
+            self.camera.update(self.fg_palm_sprites)
 
-        #background palms
-        self.bg_palm_sprites.update(self.world_shift)
-        self.bg_palm_sprites.draw(self.display_surface)
+        #particles
+        with profiler.section('particles'):
+            self.dust_particles.update()
+            self.explosion_particles.update()
+
+        #enemy
+        with profiler.section('enemies'):
+            self.enemies.update(controls.get_ticks())
+        with profiler.section('collisions'):
+            self.check_loot_crate()
+
+        #player sprites
+        with profiler.section('player'):
+            self.player.update()
+            self.equate_positions()
+        with profiler.section('collisions'):
+            self.horizontal_movement_collision()
+            self.get_player_on_ground()
+            self.vertical_movement_collision()
+        with profiler.section('player'):
+            self.create_landing_dust()
+            self.scroll_x()
+            if self.dragon_created and self.active_player == 'dragon':
+                self.dragon.update()
+
+            self.check_death()
+            self.check_win()
+            self.player.sprite.invincibility_boost(self.invincibility_boost_start_time)
+            self.player.sprite.running_speed_boost(self.running_speed_boost_start_time)
+            self.player.sprite.gravity_boost(self.gravity_boost_start_time)
+        with profiler.section('collisions'):
+            self.check_coin_collisions()
+            self.check_enemy_collisions()
+            self.check_heart_collisions()
 
-        #dust particles
-        self.dust_sprite.update(self.world_shift)
-        self.dust_sprite.draw(self.display_surface)
+        #water
+        with profiler.section('water'):
+            self.water.update(self.camera)
+
+        # item slots
+        with profiler.section('item ui'):
+            self.item_manager.update(self.owned_items)
+            self.get_input()
+
+    def draw(self, alpha = 1):
+        # alpha is how far the frame is between the last two simulation steps
+        self.camera.begin_frame(alpha)
+
+        #decoration
+        with profiler.section('decoration'):
+            self.sky.draw(self.display_surface)
+            self.clouds.draw(self.camera)
+            self.camera.draw(self.bg_palm_sprites)
+        with profiler.section('particles'):
+            self.dust_particles.draw(self.camera)
 
         #terrain
-        self.terrain_sprites.draw(self.display_surface)
-        self.terrain_sprites.update(self.world_shift)
+        with profiler.section('decoration'):
+            self.terrain_layer.draw(self.camera)
 
         #enemy
-        self.enemy_sprites.update(self.world_shift)
-        self.constraint_sprites.update(self.world_shift)
-        self.enemy_collision_reverse()
-        self.enemy_sprites.draw(self.display_surface)
-        self.explosion_sprites.update(self.world_shift)
-        self.explosion_sprites.draw(self.display_surface)
-
-        #crate
-        self.crate_sprites.update(self.world_shift)
-        self.crate_sprites.draw(self.display_surface)
-        self.check_loot_crate()
-
-        # hearts
-        self.heart_sprites.update(self.world_shift)
-        self.heart_sprites.draw(self.display_surface)
-
-        # grass
-        self.grass_sprites.update(self.world_shift)
-        self.grass_sprites.draw(self.display_surface)
-
-        #coins 
-        self.coin_sprites.update(self.world_shift)
-        self.coin_sprites.draw(self.display_surface)
-
-        #foreground palms
-        self.fg_palm_sprites.update(self.world_shift)
-        self.fg_palm_sprites.draw(self.display_surface)
+        with profiler.section('enemies'):
+            self.enemies.draw(self.camera)
+        with profiler.section('particles'):
+            self.explosion_particles.draw(self.camera)
+
+        #crates, hearts, grass, coins and foreground palms
+        with profiler.section('decoration'):
+            self.camera.draw(self.crate_sprites)
+            self.camera.draw(self.heart_sprites)
+            self.grass_layer.draw(self.camera)
+            self.camera.draw(self.coin_sprites)
+            self.camera.draw(self.fg_palm_sprites)
 
         #player sprites
-        self.jump_boost_sprites.update(self.world_shift)
-        self.player.update()
-        self.equate_positions()
-        self.horizontal_movement_collision()
-        self.get_player_on_ground()
-        self.vertical_movement_collision()
-        self.create_landing_dust()
-        self.scroll_x()
-        if self.dragon_created:
-            if self.active_player == 'dragon':
-                self.dragon.update()
-            elif self.active_player == 'player':
-                self.dragon.sprite.update_shift(self.world_shift)
-            self.dragon.draw(self.display_surface)
-        else:
-            self.dragon_x += self.world_shift
-        self.player.draw(self.display_surface)
-        self.goal.update(self.world_shift)
-        self.goal.draw(self.display_surface)
-
-        self.check_death()
-        self.check_win()
-        self.player.sprite.invincibility_boost(self.invincibility_boost_start_time)
-        self.player.sprite.running_speed_boost(self.running_speed_boost_start_time)
-        self.player.sprite.gravity_boost(self.gravity_boost_start_time)
-        if self.freeze_start_time != 0:
-            for enemy in self.enemy_sprites.sprites():
-                enemy.freeze_speed_boost(self.freeze_start_time)
-        self.check_coin_collisions()
-        self.check_enemy_collisions()
-        self.check_heart_collisions()
+        with profiler.section('player'):
+            self.player.sprite.draw_effects()
+            if self.dragon_created:
+                if self.active_player == 'dragon':
+                    self.dragon.sprite.draw_effects()
+                self.camera.draw(self.dragon, True)
+            self.camera.draw(self.player, True)
+            self.camera.draw(self.goal)
 
         #water
-        self.water.draw(self.display_surface, self.world_shift)
+        with profiler.section('water'):
+            self.water.draw(self.camera)
 
         # item slots
-        self.item_manager.update(self.owned_items)
-        self.get_input()
-        self.item_manager.draw()
\ No newline at end of file
+        with profiler.section('item ui'):
+            self.item_manager.draw()
+
+    def sprite_counts(self):
+        # for the profiler overlay
+        return {
+            'terrain': len(self.terrain_sprites),
+            'grass': len(self.grass_sprites),
+            'crates': len(self.crate_sprites),
+            'coins': len(self.coin_sprites),
+            'palms': len(self.fg_palm_sprites) + len(self.bg_palm_sprites),
+            'enemies': len(self.enemies),
+            'hearts': len(self.heart_sprites),
+            'particles': len(self.dust_particles) + len(self.explosion_particles),
+            'water': len(self.water.water_sprites),
+            'drawn': self.camera.drawn_sprites,
+            'total': self.camera.total_sprites,
+        }
+
+    def run(self):
+        self.update()
+        self.draw()
@@ -1,15 +1,21 @@
 import pygame
 import sys
+import os
+import time
+import argparse
 from settings import *
 from tiles import Tile
 from level import Level
 from overworld import Overworld
 from ui import UI
 from shop import Shop
+from controls import controls
+from profiler import profiler
+from audio import audio
 
 # Game Class is used to switch the game between the levels and the overworld
 class Game:
-    def __init__(self):
+    def __init__(self, surface):
         ## Attributes declared here will remain regardless of game state (level vs overworld)
         ## these are the starting values
         #game attributes
@@ -19,39 +25,37 @@ class Game:
         self.coins = 0
 
         # audio
-        self.level_bg_music = pygame.mixer.Sound('../audio/level_music.wav')
-        self.overworld_bg_music = pygame.mixer.Sound('../audio/overworld_music.wav')
+        audio.setup()
 
         # items
         self.owned_items = []
 
+        # display
+        self.display_surface = surface
+
         # overworld creation
-        self.overworld = Overworld(0, self.max_level, screen, self.create_level, self.coins, self.create_shop, self.owned_items)
+        self.overworld = Overworld(0, self.max_level, self.display_surface, self.create_level, self.coins, self.create_shop, self.owned_items)
         self.status = 'overworld'
-        self.overworld_bg_music.play(loops = -1)
+        audio.play_music('overworld')
 
         # user interface
-        self.ui = UI(screen)
+        self.ui = UI(self.display_surface)
 
     def create_level(self, current_level, owned_items):
-        self.level = Level(current_level, screen, self.create_overworld, self.change_coins, self.change_health, owned_items)
-        self.status = 'level'
-        self.overworld_bg_music.stop()
-        self.level_bg_music.play(loops = -1)
+        self.level = Level(current_level, self.display_surface, self.create_overworld, self.change_coins, self.change_health, owned_items)
+        self.status = 'loading'
+        audio.play_music('level')
     
     def create_overworld(self, current_level, new_max_level, owned_items):
         if new_max_level > self.max_level:
             self.max_level = new_max_level
-        self.overworld = Overworld(current_level, self.max_level, screen, self.create_level, self.coins, self.create_shop, owned_items)
+        self.overworld = Overworld(current_level, self.max_level, self.display_surface, self.create_level, self.coins, self.create_shop, owned_items)
         self.status = 'overworld'
-        self.level_bg_music.stop()
-        self.overworld_bg_music.stop()
-        self.overworld_bg_music.play(loops = -1)
+        audio.play_music('overworld')
     
     def create_shop(self, coins, surface, owned_items, max_level):
         self.shop = Shop(surface, coins, self.remove_coins, self.create_overworld, owned_items, max_level)
-        self.overworld_bg_music.stop()
-        self.overworld_bg_music.play(loops = -1)
+        audio.play_music('overworld')
         self.status = 'shop'
 
     def change_coins(self, amount):
@@ -68,41 +72,154 @@ class Game:
             self.cur_health = self.max_health
             self.coins = 0
             self.max_level = 0
-            self.overworld = Overworld(0, self.max_level, screen, self.create_level, self.coins, self.create_shop, owned_items)
+            self.overworld = Overworld(0, self.max_level, self.display_surface, self.create_level, self.coins, self.create_shop, owned_items)
             self.status = 'overworld'
-            self.level_bg_music.stop()
-            self.overworld_bg_music.play(loops = -1)
+            audio.play_music('overworld')
 
-    def run(self):
+    def update(self):
+        # one fixed simulation step
+        if self.status == 'overworld':
+            self.overworld.update()
+        elif self.status == 'shop':
+            self.shop.update()
+        elif self.status == 'level':
+            self.level.update()
+            self.check_game_over(self.owned_items)
+
+    def draw(self, alpha = 1):
+        # returns the changed screen areas, or None when the whole display has to be updated
+        if profiler.enabled:
+            self.redraw_screen()
+        dirty_rects = self.draw_screen(alpha)
+        if profiler.enabled:
+            sprite_counts = self.level.sprite_counts() if self.status == 'level' else {}
+            self.ui.show_profiler(profiler, sprite_counts)
+            return None
+        return dirty_rects
+
+    def toggle_profiler(self):
+        profiler.toggle()
+        self.redraw_screen()
+
+    def redraw_screen(self):
+        # the overworld and the shop only redraw what changed, which would leave the overlay on screen
+        self.overworld.dirty_tracker.full_redraw = True
+        if self.status == 'shop':
+            self.shop.redraw = True
+
+    def draw_screen(self, alpha):
         if self.status == 'overworld':
-            self.overworld.run()
+            return self.overworld.draw()
         elif self.status == 'shop':
-            self.shop.run()
+            dirty_rects = self.shop.draw()
             self.ui.show_coins(self.coins)
+            return dirty_rects
+        elif self.status == 'loading':
+            # loading works to a time budget per rendered frame, not per simulation step
+            if self.level.load():
+                self.status = 'level'
+            self.ui.show_loading(self.level.load_progress())
+            return None
         else:
-            self.level.run()
+            self.level.draw(alpha)
             self.ui.show_health(self.cur_health, self.max_health)
             self.ui.show_coins(self.coins)
-            self.check_game_over(self.owned_items)
-
-pygame.init()
+            return None
 
-pygame.event.set_allowed([pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.KEYUP])
-
-screen = pygame.display.set_mode((screen_width, screen_height))
-
-clock = pygame.time.Clock()
-
-game = Game()
-
-while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-    
-
-    screen.fill('black')
-    game.run()
-    pygame.display.update()
-    clock.tick(60)
\ No newline at end of file
+    def run(self):
+        self.update()
+        return self.draw()
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--headless', action = 'store_true', default = os.environ.get('GAME_HEADLESS') == '1',
+                        help = 'run without a window or sound, as fast as possible (also GAME_HEADLESS=1)')
+    parser.add_argument('--frames', type = int, default = 600, help = 'frames to simulate in headless mode')
+    parser.add_argument('--script', help = 'scripted input file, see controls.Controls.load_script')
+    parser.add_argument('--level', type = int, help = 'start in this level instead of the overworld')
+    return parser.parse_args()
+
+def run_headless(game, frames):
+    # one simulation step and one render per frame, with no waiting in between
+    start = time.perf_counter()
+    for frame in range(frames):
+        pygame.event.pump()
+        controls.next_frame()
+        game.run()
+        audio.update()
+    elapsed = time.perf_counter() - start
+    print(f'{frames} frames in {elapsed:.2f}s ({frames / elapsed:.1f} fps, {elapsed / frames * 1000:.2f} ms per frame)')
+
+def run_window(game):
+    # fixed timestep: the simulation catches up in steps of 1 / simulation_rate with the time
+    # that passed, and the frame is drawn at the fraction of a step that is left over
+    clock = pygame.time.Clock()
+    step = 1 / simulation_rate
+    accumulator = 0
+    previous_time = time.perf_counter()
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                game.toggle_profiler()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and profiler.enabled:
+                print(f'profile saved to {profiler.dump()}')
+
+        profiler.begin_frame()
+        current_time = time.perf_counter()
+        accumulator = min(accumulator + current_time - previous_time, step * max_simulation_steps)
+        previous_time = current_time
+        if game.status == 'loading':
+            # loading frames are not game time, the level starts from a clean step
+            accumulator = 0
+
+        steps = 0
+        while accumulator >= step:
+            controls.next_frame()
+            game.update()
+            accumulator -= step
+            steps += 1
+
+        audio.update()
+
+        # nothing in the overworld and the shop moves between steps, so they are only drawn after one
+        # and wait for the next step instead of rendering at max_render_rate
+        menu = game.status in ('overworld', 'shop')
+        if steps or not menu:
+            # every screen starts with a full screen sky, so there is no clear here
+            dirty_rects = game.draw(accumulator / step)
+            if dirty_rects is None:
+                pygame.display.update()
+            else:
+                pygame.display.update(dirty_rects)
+        clock.tick(simulation_rate if menu else max_render_rate)
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.headless:
+        # the dummy drivers have to be picked before pygame starts up
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+    pygame.init()
+
+    pygame.event.set_allowed([pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.KEYUP])
+
+    screen = pygame.display.set_mode((screen_width, screen_height))
+
+    if args.script:
+        controls.load_script(args.script)
+    elif args.headless:
+        controls.set_script([])
+
+    game = Game(screen)
+    if args.level is not None:
+        game.create_level(args.level, game.owned_items)
+
+    if args.headless:
+        run_headless(game, args.frames)
+        pygame.quit()
+    else:
+        run_window(game)
@@ -1,42 +1,45 @@
 from platform import node
 import pygame
-from support import import_folder
+from support import import_image
+from animation import import_clip
 from game_data import levels
 from decoration import Sky
+from dirty import DirtyTracker
+from preload import level_preloader
+from controls import controls
 
 class Node(pygame.sprite.Sprite):
-    def __init__(self, pos, status, icon_speed, path):
+    def __init__(self, pos, status, icon_speed, clip_name):
         super().__init__()
-        self.frames = import_folder(path)
+        self.clip = import_clip(clip_name)
         self.frame_index = 0
-        self.image = self.frames[self.frame_index]
+        self.image = self.clip.frame(self.frame_index)
         if status == 'available':
             self.status = 'available'
         else:
             self.status = 'locked'
+            # frames are shared through the asset cache, so tint a private copy
+            self.image = self.image.copy()
+            self.image.fill('black', None, pygame.BLEND_RGB_MULT)
         self.rect = self.image.get_rect(center = pos)
 
         self.detection_zone  = pygame.Rect(self.rect.centerx - (icon_speed /2), self.rect.centery - (icon_speed /2), icon_speed, icon_speed)
 
     def animate(self):
-        self.frame_index += 0.15
-        if self.frame_index >= len(self.frames):
+        self.frame_index += self.clip.speed
+        if self.frame_index >= len(self.clip):
             self.frame_index = 0
-        self.image = self.frames[int(self.frame_index)]
+        self.image = self.clip.frame(self.frame_index)
     
     def update(self):
         if self.status == 'available':
             self.animate()
-        else:
-            tint_surf = self.image.copy()
-            tint_surf.fill('black', None, pygame.BLEND_RGBA_MULT)
-            self.image.blit(tint_surf, (0,0))
 
 class Icon(pygame.sprite.Sprite):
     def __init__(self, pos):
         super().__init__()
         self.pos = pos
-        self.image = pygame.image.load('../graphics/overworld/hat.png').convert_alpha()
+        self.image = import_image('../graphics/overworld/hat.png')
         self.rect = self.image.get_rect(center = pos)
 
     def update(self):
@@ -60,13 +63,22 @@ class Overworld:
         self.setup_icon()
         self.sky = Sky(8, 'overworld')
 
+        #static background and dirty rect drawing
+        self.background = pygame.Surface(self.display_surface.get_size()).convert()
+        self.sky.draw(self.background)
+        self.draw_paths(self.background)
+        self.dirty_tracker = DirtyTracker(self.display_surface, self.background)
+
+        # start preparing the level under the icon
+        level_preloader.request(self.current_level)
+
         # shop
         self.coins = coins
         self.create_shop = create_shop
         self.owned_items = owned_items
 
         # time
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = controls.get_ticks()
         self.allow_input = False
         self.timer_length = 300
 
@@ -74,15 +86,15 @@ class Overworld:
         self.nodes = pygame.sprite.Group()
         for index, node_data in enumerate(levels.values()):
             if index <= self.max_level:
-                node_sprite = Node(node_data['node_pos'], 'available', self.speed, node_data['node_graphics'])
+                node_sprite = Node(node_data['node_pos'], 'available', self.speed, f'node {index}')
             else:
-                node_sprite = Node(node_data['node_pos'], 'locked', self.speed, node_data['node_graphics'])
+                node_sprite = Node(node_data['node_pos'], 'locked', self.speed, f'node {index}')
             self.nodes.add(node_sprite)
 
-    def draw_paths(self):
+    def draw_paths(self, surface):
         if self.max_level > 0:
             points = [node['node_pos'] for index, node in enumerate(levels.values()) if index <= self.max_level]
-            pygame.draw.lines(self.display_surface, '#a04f45', False, points, 6)
+            pygame.draw.lines(surface, '#a04f45', False, points, 6)
 
     def setup_icon(self):
         self.icon = pygame.sprite.GroupSingle()
@@ -90,17 +102,19 @@ class Overworld:
         self.icon.add(icon_sprite)
 
     def input(self):
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
 
         if not self.moving and self.allow_input:
             if (keys[pygame.K_RIGHT] or keys[pygame.K_d]) and self.current_level < self.max_level:
                 self.move_direction = self.get_movement_data('next')
                 self.current_level += 1
                 self.moving = True
+                level_preloader.cancel()
             elif (keys[pygame.K_LEFT] or keys[pygame.K_a]) and self.current_level > 0:
                 self.move_direction = self.get_movement_data('previous')
                 self.current_level -= 1
                 self.moving = True
+                level_preloader.cancel()
             elif keys[pygame.K_SPACE]:
                 self.create_level(self.current_level, self.owned_items)
             elif keys[pygame.K_e]:
@@ -123,21 +137,24 @@ class Overworld:
             if target_node.detection_zone.collidepoint(self.icon.sprite.pos):
                 self.moving = False
                 self.move_direction = pygame.math.Vector2(0,0)
+                level_preloader.request(self.current_level)
 
     def input_timer(self):
         if not self.allow_input:
-            current_time = pygame.time.get_ticks()
+            current_time = controls.get_ticks()
             if current_time - self.start_time >= self.timer_length:
                 self.allow_input = True
 
-    def run(self):
+    def update(self):
         self.input_timer()
         self.input()
         self.update_icon_pos()
         self.icon.update()
         self.nodes.update()
 
-        self.sky.draw(self.display_surface)
-        self.draw_paths()
-        self.nodes.draw(self.display_surface)
-        self.icon.draw(self.display_surface)
\ No newline at end of file
+    def draw(self):
+        return self.dirty_tracker.draw([self.nodes, self.icon])
+
+    def run(self):
+        self.update()
+        return self.draw()
@@ -1,27 +1,60 @@
 import pygame
-from support import import_folder
-
-class ParticleEffect(pygame.sprite.Sprite):
-    def __init__(self, pos, type):
-        super().__init__()
-        self.frame_index = 0
-        self.animation_speed = 0.5
-        if type == 'jump':
-            self.frames = import_folder('../graphics/character/dust_particles/jump')
-        if type == 'land':
-            self.frames = import_folder('../graphics/character/dust_particles/land')
-        if type == 'explosion':
-            self.frames = import_folder('../graphics/enemy/explosion')
-        self.image = self.frames[self.frame_index]
-        self.rect = self.image.get_rect(center = pos)
-
-    def animate(self):
-        self.frame_index += self.animation_speed
-        if self.frame_index >= len(self.frames):
-            self.kill()
+from animation import import_clip
+
+# effects a pool can play, their clips are loaded once with the pool
+particle_types = ['jump', 'land', 'explosion']
+
+class ParticlePool:
+    def __init__(self, size):
+        self.clips = {type: import_clip(type) for type in particle_types}
+
+        # fixed slots, a finished particle's slot is handed to the next one
+        self.slot_clips = [None] * size
+        self.frame_indices = [0] * size
+        self.rects = [pygame.Rect(0, 0, 0, 0) for slot in range(size)]
+        self.free_slots = list(range(size - 1, -1, -1))
+        self.active_slots = []
+
+    def __len__(self):
+        return len(self.active_slots)
+
+    def spawn(self, type, center_x, center_y):
+        if self.free_slots:
+            slot = self.free_slots.pop()
         else:
-            self.image = self.frames[int(self.frame_index)]
+            # every slot is busy, the oldest particle makes room
+            slot = self.active_slots.pop(0)
+        clip = self.clips[type]
+        self.slot_clips[slot] = clip
+        self.frame_indices[slot] = 0
+        rect = self.rects[slot]
+        rect.size = clip.frames[0].get_size()
+        rect.center = (center_x, center_y)
+        self.active_slots.append(slot)
+
+    def update(self):
+        finished = False
+        for slot in self.active_slots:
+            clip = self.slot_clips[slot]
+            self.frame_indices[slot] += clip.speed
+            if self.frame_indices[slot] >= len(clip):
+                finished = True
+
+        if finished:
+            active_slots = []
+            for slot in self.active_slots:
+                if self.frame_indices[slot] < len(self.slot_clips[slot]):
+                    active_slots.append(slot)
+                else:
+                    self.slot_clips[slot] = None
+                    self.free_slots.append(slot)
+            self.active_slots = active_slots
 
-    def update(self, x_shift):
-        self.animate()
-        self.rect.x += x_shift
\ No newline at end of file
+    def draw(self, camera):
+        # all live particles go to the screen in one blits call
+        offset_x = -int(camera.draw_offset.x)
+        offset_y = -int(camera.draw_offset.y)
+        camera.display_surface.blits([(self.slot_clips[slot].frames[int(self.frame_indices[slot])], self.rects[slot].move(offset_x, offset_y))
+            for slot in self.active_slots], False)
+        camera.total_sprites += len(self.active_slots)
+        camera.drawn_sprites += len(self.active_slots)
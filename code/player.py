@@ -1,23 +1,26 @@
 #player.py
 import pygame
-from support import import_folder, import_cut_graphics
+from animation import import_clip
 from math import sin
 from settings import screen_width
+from controls import controls
+from audio import audio
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, pos, surface, create_jump_particles, change_health):
+    def __init__(self, pos, surface, create_jump_particles, change_health, camera):
         super().__init__()
         self.import_character_assets()
         self.frame_index = 0
         self.animation_speed = 0.15
-        self.image = self.animations['idle'][self.frame_index]
+        self.image = self.animations['idle'].frame(self.frame_index)
         self.rect = self.image.get_rect(topleft = pos)
 
         #dust particles
         self.import_dust_run_particles()
         self.dust_frame_index = 0
-        self.dust_animation_speed = 0.15
+        self.dust_animation_speed = self.dust_run_particles.speed
         self.display_surface = surface
+        self.camera = camera
         self.create_jump_particles = create_jump_particles
 
         #player movement
@@ -53,21 +56,13 @@ class Player(pygame.sprite.Sprite):
         self.projectile.add(self.fireball)
         self.projectile_direction = True
 
-        # audio
-        self.jump_sound = pygame.mixer.Sound('../audio/effects/jump.wav')
-        self.jump_sound.set_volume(0.8)
-        self.hit_sound = pygame.mixer.Sound('../audio/effects/hit.wav')
-
     def import_character_assets(self):
-        character_path = '../graphics/character/'
-        self.animations = {'idle':[], 'run':[], 'jump':[], 'fall':[]}
+        self.animations = {'idle':None, 'run':None, 'jump':None, 'fall':None}
         for animation in self.animations.keys():
-            full_path = character_path + animation
-            self.animations[animation] = import_folder(full_path)
+            self.animations[animation] = import_clip('player ' + animation)
     
     def import_dust_run_particles(self):
-        self.dust_run_particles = import_folder('../graphics/character/dust_particles/run')
-        print(len(self.dust_run_particles))
+        self.dust_run_particles = import_clip('run dust')
 
     def animate(self):
         animation = self.animations[self.status]
@@ -77,13 +72,10 @@ class Player(pygame.sprite.Sprite):
         if self.frame_index >= len(animation):
             self.frame_index = 0
         
-        image = animation[int(self.frame_index)]
+        self.image = animation.frame(self.frame_index, not self.facing_right)
         if self.facing_right:
-            self.image = image
             self.rect.bottomleft = self.collision_rect.bottomleft
         else:
-            flipped_image = pygame.transform.flip(image, True, False)
-            self.image = flipped_image
             self.rect.bottomright = self.collision_rect.bottomright
         
         if self.invincible:
@@ -99,18 +91,21 @@ class Player(pygame.sprite.Sprite):
             self.dust_frame_index += self.dust_animation_speed
             if self.dust_frame_index >= len(self.dust_run_particles):
                 self.dust_frame_index = 0
-            
-            dust_particle = self.dust_run_particles[int(self.dust_frame_index)]
+
+    def draw_run_dust(self):
+        if self.status == 'run' and self.on_ground:
+            dust_particle = self.dust_run_particles.frame(self.dust_frame_index, not self.facing_right)
             if self.facing_right:
                 pos = self.rect.bottomleft - pygame.math.Vector2(6,10)
-                self.display_surface.blit(dust_particle, pos)
             else:
                 pos = self.rect.bottomright - pygame.math.Vector2(6,10)
-                flipped_dust_particle = pygame.transform.flip(dust_particle, True, False)
-                self.display_surface.blit(flipped_dust_particle, pos)
+            # the dust stays at the feet of the interpolated player
+            x, y = self.camera.interpolated_topleft(self)
+            pos += (x - self.rect.x, y - self.rect.y)
+            self.display_surface.blit(dust_particle, self.camera.apply_point(pos))
 
     def get_input(self):
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
 
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
             self.direction.x = 1
@@ -144,7 +139,7 @@ class Player(pygame.sprite.Sprite):
     
     def jump(self):
         self.direction.y = self.jump_speed
-        self.jump_sound.play()
+        audio.play('jump')
     
     def set_jump_boost(self):
         self.jump_speed = -32
@@ -157,45 +152,46 @@ class Player(pygame.sprite.Sprite):
         self.projectile_direction = self.facing_right
     
     def reset_projectile(self):
-        if self.projectile.sprite.getX() >= screen_width or self.projectile.sprite.getX() < -1:
+        projectile_x = self.projectile.sprite.getX() - self.camera.offset.x
+        if projectile_x >= screen_width or projectile_x < -1:
             self.shot = False
 
     def get_damage(self):
         if not self.invincible:
-            self.hit_sound.play()
+            audio.play('hit')
             self.change_health(-10)
             self.invincible = True
-            self.hurt_time = pygame.time.get_ticks()
+            self.hurt_time = controls.get_ticks()
 
     def invincibility_timer(self):
         if self.invincible and not self.invincibility_potion:
-            current_time = pygame.time.get_ticks()
+            current_time = controls.get_ticks()
             if current_time - self.hurt_time >= self.invincibility_duration:
                 self.invincible = False
     
     def invincibility_boost(self, start_time):
         if self.invincible and self.invincibility_potion:
-            current_time = pygame.time.get_ticks()
+            current_time = controls.get_ticks()
             if current_time - start_time >= 3000:
                 self.invincible = False
                 self.invincibility_potion = False
     
     def running_speed_boost(self, start_time):
         if self.running_speed_potion:
-            current_time = pygame.time.get_ticks()
+            current_time = controls.get_ticks()
             if current_time - start_time >= 3000:
                 self.boost_speed = 0
                 self.running_speed_potion = False
 
     def gravity_boost(self, start_time):
         if self.gravity_potion:
-            current_time = pygame.time.get_ticks()
+            current_time = controls.get_ticks()
             if current_time - start_time >= 3000:
                 self.gravity = 0.8
                 self.gravity_potion = False
 
     def wave_value(self):
-        value = sin(pygame.time.get_ticks())
+        value = sin(controls.get_ticks())
         if value >= 0: return 255
         else: return 0
 
@@ -209,17 +205,20 @@ class Player(pygame.sprite.Sprite):
         self.run_dust_animation()
         self.invincibility_timer()
         self.wave_value()
-        if self.shot: self.projectile.draw(self.display_surface)
+
+    def draw_effects(self):
+        self.draw_run_dust()
+        if self.shot: self.camera.draw(self.projectile, True)
 
 
 class FireBall(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
         self.frame_index = 0
-        self.animation_speed = 0.25
-        self.animations = import_cut_graphics('../graphics/character/fire_bullets.png')
-        self.original_image = self.animations[self.frame_index]
-        self.flipped_image = pygame.transform.flip(self.original_image, True, False)
+        self.animations = import_clip('fireball')
+        self.animation_speed = self.animations.speed
+        self.original_image = self.animations.frame(self.frame_index)
+        self.flipped_image = self.animations.frame(self.frame_index, True)
         self.image = self.original_image
         self.rect = self.image.get_rect(center = (0,0))
         self.speed = 10
@@ -237,14 +236,7 @@ class FireBall(pygame.sprite.Sprite):
         if self.frame_index >= len(animation):
             self.frame_index = 0
         
-        image = animation[int(self.frame_index)]
-        if facingRight:
-            self.image = image
-            #self.rect.bottomleft = self.collision_rect.bottomleft
-        else:
-            flipped_image = pygame.transform.flip(image, True, False)
-            self.image = flipped_image
-            #self.rect.bottomright = self.collision_rect.bottomright
+        self.image = animation.frame(self.frame_index, not facingRight)
     
     def update(self, shot, playerCenterX, playerCenterY, facingRight):
         if not shot:
@@ -264,19 +256,16 @@ class FireBall(pygame.sprite.Sprite):
 
 
 class Dragon(pygame.sprite.Sprite):
-    def __init__(self, pos, surface, change_health):
+    def __init__(self, pos, surface, change_health, camera):
         super().__init__()
         self.import_character_assets()
         self.frame_index = 0
         self.animation_speed = 0.15
-        self.image = self.animations[self.frame_index]
+        self.image = self.animations.frame(self.frame_index)
         self.rect = self.image.get_rect(topleft = pos)
         
-        #dust particles
-        #self.dust_frame_index = 0
-        #self.import_dust_run_particles()
-        #self.dust_animation_speed = 0.15
         self.display_surface = surface
+        self.camera = camera
         #self.create_jump_particles = create_jump_particles
 
         #dragon movement
@@ -311,20 +300,10 @@ class Dragon(pygame.sprite.Sprite):
 
         # audio
         # Add some wing flap sounds
-        self.jump_sound = pygame.mixer.Sound('../audio/effects/jump.wav')
-        self.jump_sound.set_volume(0.8)
-        self.hit_sound = pygame.mixer.Sound('../audio/effects/hit.wav')
 
     def import_character_assets(self):
-        dragon_path = '../graphics/dragon'
-        self.animations = []
-        self.dragon_image = import_folder(dragon_path)
-        for image in self.dragon_image:
-            self.animations.append(image)
+        self.animations = import_clip('dragon')
     
-    #def import_dust_run_particles(self):
-    #    self.dust_run_particles = import_folder('../graphics/character/dust_particles/run')
-
     def animate(self):
         animation = self.animations
 
@@ -333,13 +312,10 @@ class Dragon(pygame.sprite.Sprite):
         if self.frame_index >= len(animation):
             self.frame_index = 0
         
-        image = animation[int(self.frame_index)]
+        self.image = animation.frame(self.frame_index, not self.facing_right)
         if self.facing_right:
-            self.image = image
             self.rect.bottomleft = self.collision_rect.bottomleft
         else:
-            flipped_image = pygame.transform.flip(image, True, False)
-            self.image = flipped_image
             self.rect.bottomright = self.collision_rect.bottomright
         
         if self.invincible:
@@ -350,23 +326,8 @@ class Dragon(pygame.sprite.Sprite):
         
         self.rect = self.image.get_rect(midbottom = self.rect.midbottom)
 
-    def run_dust_animation(self):
-        if self.status == 'run' and self.on_ground:
-            self.dust_frame_index += self.dust_animation_speed
-            if self.dust_frame_index >= len(self.dust_run_particles):
-                self.dust_frame_index = 0
-            
-            dust_particle = self.dust_run_particles[int(self.dust_frame_index)]
-            if self.facing_right:
-                pos = self.rect.bottomleft - pygame.math.Vector2(6,10)
-                self.display_surface.blit(dust_particle, pos)
-            else:
-                pos = self.rect.bottomright - pygame.math.Vector2(6,10)
-                flipped_dust_particle = pygame.transform.flip(dust_particle, True, False)
-                self.display_surface.blit(flipped_dust_particle, pos)
-
     def get_input(self):
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
             self.direction.x = 1
             self.facing_right = True
@@ -393,7 +354,8 @@ class Dragon(pygame.sprite.Sprite):
         self.projectile_direction = self.facing_right
     
     def reset_projectile(self):
-        if self.projectile.sprite.getX() >= screen_width or self.projectile.sprite.getX() < -1:
+        projectile_x = self.projectile.sprite.getX() - self.camera.offset.x
+        if projectile_x >= screen_width or projectile_x < -1:
             self.shot = False
 
     def get_status(self):
@@ -413,31 +375,29 @@ class Dragon(pygame.sprite.Sprite):
     
     def jump(self):
         self.direction.y = self.jump_speed
-        self.jump_sound.play()
+        audio.play('jump')
 
     def get_damage(self):
         if not self.invincible:
-            self.hit_sound.play()
+            audio.play('hit')
             self.change_health(-10)
             self.invincible = True
-            self.hurt_time = pygame.time.get_ticks()
+            self.hurt_time = controls.get_ticks()
 
     def invincibility_timer(self):
         if self.invincible:
-            current_time = pygame.time.get_ticks()
+            current_time = controls.get_ticks()
             if current_time - self.hurt_time >= self.invincibility_duration:
                 self.invincible = False
 
     def wave_value(self):
-        value = sin(pygame.time.get_ticks())
+        value = sin(controls.get_ticks())
         if value >= 0: return 255
         else: return 0
     
     def dismount_player():
         return True
 
-    def update_shift(self, shift):
-        if not self.active: self.rect.x += shift
     def update(self):
         self.get_input()
         if self.active:
@@ -445,7 +405,8 @@ class Dragon(pygame.sprite.Sprite):
         self.reset_projectile()
         #self.get_status()
         self.animate()
-        #self.run_dust_animation()
         self.invincibility_timer()
         self.wave_value()
-        if self.shot: self.projectile.draw(self.display_surface)
\ No newline at end of file
+
+    def draw_effects(self):
+        if self.shot: self.camera.draw(self.projectile, True)
\ No newline at end of file
@@ -0,0 +1,106 @@
+# preload.py
+import os
+import threading
+import pygame
+from collections import OrderedDict
+from cache import asset_cache
+from compiled_level import load_compiled_level
+from tilemap import TileMap
+from animation import clip_data
+from settings import preload_cache_size
+
+## single images every level uses on top of the frame folders in animation.clip_data, all loaded as 'alpha'
+level_images = [
+    '../graphics/terrain/terrain_tiles.png',
+    '../graphics/decoration/grass/grass.png',
+    '../graphics/terrain/crate.png',
+    '../graphics/character/heart.png',
+    '../graphics/character/hat.png',
+    '../graphics/items/empty_slots_good.png'
+]
+## the sky images are left out: they are loaded 'opaque' and only once, the composed backdrop is shared after that
+level_folders = ['../graphics/decoration/clouds']
+
+def level_asset_paths():
+    paths = list(level_images)
+    folders = level_folders + [path for name, (path, speed, mirrored) in clip_data.items() if not name.startswith('node')]
+    for folder in folders:
+        if folder.endswith('.png'):
+            paths.append(folder)
+            continue
+        for _,__,image_files in os.walk(folder):
+            paths.extend(folder + '/' + image for image in image_files)
+    return paths
+
+class LevelPreloader:
+    def __init__(self, cache_size = preload_cache_size):
+        # prepared tile maps, least recently used first
+        self.prepared = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+
+        # current background job
+        self.thread = None
+        self.thread_level = None
+        self.cancel_event = threading.Event()
+
+    def request(self, level):
+        with self.lock:
+            if level in self.prepared:
+                self.prepared.move_to_end(level)
+                return
+        if self.thread_level == level and self.thread.is_alive() and not self.cancel_event.is_set():
+            return
+
+        self.cancel()
+        self.cancel_event = threading.Event()
+        self.thread_level = level
+        self.thread = threading.Thread(target = self.prepare, args = (level, self.cancel_event), daemon = True)
+        self.thread.start()
+
+    def cancel(self):
+        # the worker stops at its next step, a half prepared level is simply dropped
+        self.cancel_event.set()
+
+    def prepare(self, level, cancel_event):
+        try:
+            tile_map = TileMap(load_compiled_level(level))
+            for name in tile_map.layers:
+                if cancel_event.is_set():
+                    return
+                tile_map.cells(name)
+
+            for path in level_asset_paths():
+                if cancel_event.is_set():
+                    return
+                if not asset_cache.is_cached(path):
+                    try:
+                        asset_cache.predecode(path)
+                    except pygame.error:
+                        # not an image (.DS_Store and friends), import_folder skips these too
+                        pass
+        except (OSError, ValueError, KeyError) as error:
+            # missing files, bad data, or a level or layer game_data doesn't list, nothing may escape the worker thread
+            print(f'Could not preload level {level}: {error}')
+            return
+
+        with self.lock:
+            self.prepared[level] = tile_map
+            self.prepared.move_to_end(level)
+            while len(self.prepared) > self.cache_size:
+                self.prepared.popitem(last = False)
+
+    def is_preparing(self, level):
+        return self.thread_level == level and self.thread is not None and self.thread.is_alive() and not self.cancel_event.is_set()
+
+    def get_tile_map(self, level):
+        # wait for a job that is already working on this level rather than loading it twice
+        if self.thread_level == level and self.thread is not None and not self.cancel_event.is_set():
+            self.thread.join()
+        with self.lock:
+            if level in self.prepared:
+                self.prepared.move_to_end(level)
+                return self.prepared[level]
+        return TileMap(load_compiled_level(level))
+
+level_preloader = LevelPreloader()
@@ -0,0 +1,88 @@
+# profiler.py
+import os
+import csv
+import time
+from time import perf_counter
+from collections import deque
+from contextlib import nullcontext
+from settings import profiler_history, profiler_folder
+
+# handed out for every section while profiling is off, so a disabled timer costs one call
+null_section = nullcontext()
+
+class Section:
+    def __init__(self, times, name):
+        self.times = times
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *args):
+        # a section entered more than once in a frame (every simulation step) adds up
+        self.times[self.name] = self.times.get(self.name, 0) + perf_counter() - self.start
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+
+        # (start time, frame ms, {section: ms}) of the frames in the last profiler_history seconds
+        self.history = deque()
+        self.frame_start = None
+        self.times = {}
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.history.clear()
+        self.frame_start = None
+        self.times = {}
+
+    def section(self, name):
+        if not self.enabled:
+            return null_section
+        return Section(self.times, name)
+
+    def begin_frame(self):
+        # closes the previous frame, called once per rendered frame
+        if not self.enabled:
+            return
+        now = perf_counter()
+        if self.frame_start is not None:
+            sections = {name: seconds * 1000 for name, seconds in self.times.items()}
+            self.history.append((self.frame_start, (now - self.frame_start) * 1000, sections))
+            while now - self.history[0][0] > profiler_history:
+                self.history.popleft()
+        self.frame_start = now
+        self.times = {}
+
+    def section_names(self):
+        names = {}
+        for start, frame_time, sections in self.history:
+            names.update(dict.fromkeys(sections))
+        return list(names)
+
+    def summary(self, seconds = 1):
+        # average frame time, fps and section times (ms) over the last few seconds
+        if not self.history:
+            return None
+        newest = self.history[-1][0]
+        frames = [frame for frame in self.history if newest - frame[0] < seconds]
+        frame_times = [frame_time for start, frame_time, sections in frames]
+        average = sum(frame_times) / len(frame_times)
+        sections = {name: sum(frame[2].get(name, 0) for frame in frames) / len(frames) for name in self.section_names()}
+        return {'frame': average, 'max': max(frame_times), 'fps': 1000 / average if average else 0, 'sections': sections}
+
+    def dump(self):
+        # writes the recorded frames to a csv file and returns its path
+        os.makedirs(profiler_folder, exist_ok = True)
+        path = os.path.join(profiler_folder, time.strftime('profile_%Y%m%d_%H%M%S.csv'))
+        names = self.section_names()
+        with open(path, 'w', newline = '') as file:
+            writer = csv.writer(file)
+            writer.writerow(['time_s', 'frame_ms'] + [name.replace(' ', '_') + '_ms' for name in names])
+            first_start = self.history[0][0] if self.history else 0
+            for start, frame_time, sections in self.history:
+                writer.writerow([round(start - first_start, 4), round(frame_time, 4)] + [round(sections.get(name, 0), 4) for name in names])
+        return path
+
+profiler = Profiler()
@@ -4,3 +4,51 @@ tile_size = 64
 screen_height = vertical_lile_number * tile_size
 screen_width = 1200
 
+# the game simulates a fixed number of steps per second, rendering runs as fast as the display allows
+simulation_rate = 60
+# rendered frames per second at most, 0 leaves rendering uncapped
+max_render_rate = 240
+# most simulation steps run for one rendered frame, time beyond that after a long hitch is dropped
+max_simulation_steps = 5
+# draw moving sprites and the camera between the last two simulation steps
+render_interpolation = True
+
+# memory budget for decoded images kept by the asset cache (bytes)
+asset_cache_budget = 64 * 1024 * 1024
+
+# extra pixels around the screen that still count as visible for drawing and animation
+view_margin = tile_size
+
+# cell size of the spatial hash used for coin, heart and crate lookups
+spatial_cell_size = tile_size * 2
+
+# size in tiles of the pre-rendered chunks used for terrain and grass
+chunk_columns = 8
+chunk_rows = vertical_lile_number
+# baked chunks further than this many chunks outside the view are released and baked again when needed
+chunk_keep_distance = 2
+
+# number of levels the overworld keeps prepared in the background
+preload_cache_size = 2
+
+# time (ms) a frame may spend building a level, and how many tiles are created between checks
+loading_frame_budget = 10
+loading_batch_size = 32
+# construction steps that aren't tiles (setup, solid grid, sky, water, clouds)
+loading_fixed_steps = 5
+
+# seconds of frame timings the profiler overlay keeps for its csv dump, and where the dumps go
+profiler_history = 10
+profiler_folder = '../profiles'
+
+# particle slots for the player's dust and for explosions, the oldest particle is replaced when they run out
+dust_particle_slots = 4
+explosion_particle_slots = 32
+
+# font used by the hud and the shop, and how many rendered strings each glyph atlas keeps
+ui_font = '../graphics/ui/ARCADEPI.TTF'
+text_cache_size = 64
+
+# music volume, and the time (ms) one track takes to fade out and the next to fade in
+music_volume = 1
+music_fade_time = 1000
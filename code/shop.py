@@ -1,18 +1,19 @@
 # shop.py
 from platform import node
-from turtle import window_width
 from venv import create
 import pygame
-from support import import_folder
+from support import import_folder, import_image
 from game_data import levels
 from decoration import Sky
-from settings import screen_height, screen_width
+from settings import screen_height, screen_width, ui_font
+from text import get_atlas
+from controls import controls
 
 class Slot(pygame.sprite.Sprite):
     def __init__(self, pos):
         super().__init__()
         self.pos = pos
-        self.image = pygame.image.load('../graphics/shop/empty_wooden_slot.png').convert_alpha()
+        self.image = import_image('../graphics/shop/empty_wooden_slot.png')
         self.rect = self.image.get_rect(center = pos)
 
     def update(self):
@@ -25,8 +26,7 @@ class ShopBanner(Slot):
         self.width, self.height = self.rect.width, self.rect.height
         self.image = pygame.transform.smoothscale(self.image, (self.width * 3, self.height * 1.5))
         self.rect = self.image.get_rect(center = pos)
-        self.font = pygame.font.Font('../graphics/ui/ARCADEPI.ttf', 100)
-        self.shop_surf = self.font.render("SHOP", False, '#33323d')
+        self.shop_surf = get_atlas(ui_font, 100, '#33323d').render("SHOP")
         self.shop_rect = self.shop_surf.get_rect(center = (self.rect.centerx, self.rect.centery))
 
     def update(self):
@@ -37,23 +37,21 @@ class ShopItem(pygame.sprite.Sprite):
     def __init__(self, surface, amount, slot_pos, path_to_item_image):
         super().__init__()
         self.display_surface = surface
-        self.font = pygame.font.Font('../graphics/ui/ARCADEPI.ttf', 30)
         self.amount = amount
         self.slot_pos = slot_pos
         self.slot_posX, self.slot_posY = slot_pos
         self.path = path_to_item_image
-        self.image = pygame.image.load(self.path).convert_alpha()
+        self.image = import_image(self.path)
         self.pos = (200 + self.slot_posX * 350, 200 + self.slot_posY * 200)
         self.coin_pos = (315 + self.slot_posX * 350, 200 + self.slot_posY * 200)
 
-        self.coin = pygame.image.load('../graphics/ui/coin.png').convert_alpha()
+        self.coin = import_image('../graphics/ui/coin.png')
         self.coin_rect = self.coin.get_rect(center = self.coin_pos)
-        print(self.coin_pos)
 
         self.rect = self.image.get_rect(center=self.pos)
         # size should be no greater than 60x60
 
-        self.coin_amount_surf = self.font.render(str(amount), False, '#33323d')
+        self.coin_amount_surf = get_atlas(ui_font, 30, '#33323d').render(str(amount))
         self.coin_amount_rect = self.coin_amount_surf.get_rect(center = (self.coin_rect.right - 65, self.coin_rect.centery))
         
     def update(self):
@@ -69,7 +67,7 @@ class Shop:
         self.max_level = max_level
         self.setup_shop_items()
         self.create_overworld = create_overworld
-        self.font = pygame.font.Font('../graphics/ui/ARCADEPI.ttf', 30)
+        self.coin_text = get_atlas(ui_font, 30, '#33323d')
 
         #sprites 
         self.sky = Sky(8, 'overworld')
@@ -90,10 +88,13 @@ class Shop:
         self.item_manager = ItemManager(self.display_surface, self.owned_items)
 
         # time
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = controls.get_ticks()
         self.allow_input = False
         self.timer_length = 300
 
+        # the shop only changes when something is bought
+        self.redraw = True
+
     def setup_shop_items(self):
         self.slot = pygame.sprite.Group()
         start_x = 250
@@ -113,7 +114,7 @@ class Shop:
 
     def show_coins(self, amount):
         self.display_surface.blit(self.coin, self.coin_rect)
-        coin_amount_surf = self.font.render(str(amount), False, '#33323d')
+        coin_amount_surf = self.coin_text.render(str(amount))
         coin_amount_rect = coin_amount_surf.get_rect(midleft = (self.coin_rect.right + 4, self.coin_rect.centery))
         self.display_surface.blit(coin_amount_surf, coin_amount_rect)
 
@@ -122,7 +123,7 @@ class Shop:
         if pygame.mouse.get_pressed()[0]:
             if self.allow_input:
                 self.allow_input = False
-                self.start_time = pygame.time.get_ticks()
+                self.start_time = controls.get_ticks()
                 mouseX, mouseY = pygame.mouse.get_pos()
                 for index, slot in enumerate(self.slot):
                     if slot.rect.collidepoint(mouseX, mouseY):
@@ -131,20 +132,19 @@ class Shop:
                                 self.owned_items = self.item_manager.add_item(item.path)
                                 self.remove_coins(item.amount)
                                 self.coins -= item.amount
+                                self.redraw = True
         
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
         if keys[pygame.K_ESCAPE]:
-            print(f"Shop Scope owned items:{self.owned_items}")
-            print(f"Item Manager Scope owned items:{self.item_manager.owned_items}")
             self.create_overworld(0, self.max_level, self.owned_items)
 
     def input_timer(self):
         if not self.allow_input:
-            current_time = pygame.time.get_ticks()
+            current_time = controls.get_ticks()
             if current_time - self.start_time >= self.timer_length:
                 self.allow_input = True
 
-    def run(self):
+    def update(self):
         self.input_timer()
         self.input()
         self.item_manager.update(self.owned_items)
@@ -152,6 +152,11 @@ class Shop:
         self.slot.update()
         #self.nodes.update()
 
+    def draw(self):
+        if not self.redraw:
+            return []
+        self.redraw = False
+
         self.sky.draw(self.display_surface)
         #self.draw_paths()
         #self.nodes.draw(self.display_surface)
@@ -160,6 +165,11 @@ class Shop:
         self.banner.draw(self.display_surface)
         self.banner.update()
         self.items.update()
+        return None
+
+    def run(self):
+        self.update()
+        return self.draw()
 
 class ItemManager():
     def __init__(self, surface, owned_items):
@@ -168,7 +178,7 @@ class ItemManager():
         self.display_surface = surface
 
         # slots
-        self.item_slot_image = pygame.image.load('../graphics/items/empty_slots_good.png').convert_alpha()
+        self.item_slot_image = import_image('../graphics/items/empty_slots_good.png')
         self.item_slot_pos = (screen_width//2, screen_height - 50)
         self.item_slot_rect = self.item_slot_image.get_rect(center = self.item_slot_pos)
         
@@ -180,7 +190,7 @@ class ItemManager():
         self.owned_items_surf = []
         for item in self.owned_items:
             if item is not None:
-                self.owned_items_surf.append(pygame.image.load(item).convert_alpha())
+                self.owned_items_surf.append(import_image(item))
 
     def draw_items_in_slot(self):
         for index, item_surf in enumerate(self.owned_items_surf):
@@ -197,19 +207,15 @@ class ItemManager():
     
     def add_item(self, new_item_path):
         if len(self.owned_items) > 0:
-            print("Adding item non zero")
             for index, item in enumerate(self.owned_items):
                 #print(item)
                 if item is None:
-                    print("Replacing None")
                     self.owned_items[index] = new_item_path
                     break
             else:
                 self.owned_items.append(new_item_path)
         elif len(self.owned_items) == 0:
-            print("Adding item from zero")
             self.owned_items.append(new_item_path)
-        print(self.owned_items)
         return self.owned_items
     
     def draw(self):
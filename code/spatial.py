@@ -0,0 +1,87 @@
+# spatial.py
+import pygame
+from settings import tile_size, spatial_cell_size
+
+class SolidGrid:
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.cells = [[[] for col in range(columns)] for row in range(rows)]
+
+    def cell_range(self, rect):
+        left = max(rect.left // tile_size, 0)
+        right = min((rect.right - 1) // tile_size, self.columns - 1)
+        top = max(rect.top // tile_size, 0)
+        bottom = min((rect.bottom - 1) // tile_size, self.rows - 1)
+        return left, right, top, bottom
+
+    def add(self, sprite):
+        left, right, top, bottom = self.cell_range(sprite.rect)
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                self.cells[row][col].append(sprite)
+
+    def add_group(self, sprite_group):
+        for sprite in sprite_group:
+            self.add(sprite)
+
+    def remove(self, sprite):
+        left, right, top, bottom = self.cell_range(sprite.rect)
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                if sprite in self.cells[row][col]:
+                    self.cells[row][col].remove(sprite)
+
+    def collide(self, rect):
+        found = {}
+        left, right, top, bottom = self.cell_range(rect)
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                for sprite in self.cells[row][col]:
+                    if sprite.rect.colliderect(rect):
+                        found[sprite] = None
+        return list(found)
+
+class SpatialGroup(pygame.sprite.Group):
+    # for sprites that stay where they are created (coins, hearts, crates): each is bucketed once when added
+    def __init__(self, *sprites, cell_size = spatial_cell_size):
+        self.cell_size = cell_size
+        self.buckets = {}
+        self.sprite_cells = {}
+        super().__init__(*sprites)
+
+    def cells_for(self, rect):
+        size = self.cell_size
+        return [(col, row)
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1)
+            for col in range(rect.left // size, (rect.right - 1) // size + 1)]
+
+    def add_internal(self, sprite, layer = None):
+        super().add_internal(sprite)
+        cells = self.cells_for(sprite.rect)
+        self.sprite_cells[sprite] = cells
+        for cell in cells:
+            self.buckets.setdefault(cell, {})[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        for cell in self.sprite_cells.pop(sprite, []):
+            bucket = self.buckets[cell]
+            del bucket[sprite]
+            if not bucket:
+                del self.buckets[cell]
+
+    def query(self, rect):
+        found = {}
+        for cell in self.cells_for(rect):
+            for sprite in self.buckets.get(cell, ()):
+                if sprite.rect.colliderect(rect):
+                    found[sprite] = None
+        return list(found)
+
+    def collide(self, sprite, dokill = False):
+        collided = self.query(sprite.rect)
+        if dokill:
+            for other in collided:
+                other.kill()
+        return collided
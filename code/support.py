@@ -2,14 +2,20 @@ from os import walk
 import pygame
 from csv import reader
 from settings import tile_size
+from cache import asset_cache
 
-def import_folder(path):
+tilesets = {}
+
+def import_image(path, mode = 'alpha'):
+	return asset_cache.load(path, mode)
+
+def import_folder(path, mode = 'alpha'):
 	surface_list = []
 	for _,__,image_files in walk(path):
 		for image in image_files:
 			full_path = path + '/' + image
 			try:
-				image_surf = pygame.image.load(full_path).convert_alpha()
+				image_surf = import_image(full_path, mode)
 				surface_list.append(image_surf)
 			except:
 				print(full_path)
@@ -24,17 +30,21 @@ def import_csv_layout(path):
 			terrain_map.append(list(row))
 		return terrain_map
 
-def import_cut_graphics(path):
-	surface = pygame.image.load(path).convert_alpha()
-	tile_num_x = int(surface.get_size()[0] / tile_size)
-	tile_num_y = int(surface.get_size()[1] / tile_size)
-
-	cut_tiles = []
-	for row in range(tile_num_y):
-		for col in range(tile_num_x):
-			x = col * tile_size
-			y = row * tile_size
-			new_surf = pygame.Surface((tile_size, tile_size), flags = pygame.SRCALPHA)
-			new_surf.blit(surface, (0,0), pygame.Rect(x, y, tile_size, tile_size))
-			cut_tiles.append(new_surf)
-	return cut_tiles
\ No newline at end of file
+def import_tileset(path):
+	# each sheet is cut once per process into subsurfaces that share its pixels
+	if path not in tilesets:
+		surface = import_image(path)
+		tile_num_x = int(surface.get_size()[0] / tile_size)
+		tile_num_y = int(surface.get_size()[1] / tile_size)
+
+		tile_list = []
+		for row in range(tile_num_y):
+			for col in range(tile_num_x):
+				x = col * tile_size
+				y = row * tile_size
+				tile_list.append(surface.subsurface(pygame.Rect(x, y, tile_size, tile_size)))
+		tilesets[path] = tile_list
+	return tilesets[path]
+
+def asset_cache_stats():
+	return asset_cache.stats()
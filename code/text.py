@@ -0,0 +1,63 @@
+# text.py
+import pygame
+from collections import OrderedDict
+from settings import text_cache_size
+
+# characters drawn into every atlas up front, anything else is rendered by the font directly
+atlas_characters = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ:/.-+% '
+
+fonts = {}
+atlases = {}
+
+def load_font(path, size):
+    # one Font per file and size for the whole game
+    key = (path, size)
+    if key not in fonts:
+        fonts[key] = pygame.font.Font(path, size)
+    return fonts[key]
+
+def get_atlas(path, size, color):
+    key = (path, size, color)
+    if key not in atlases:
+        atlases[key] = GlyphAtlas(load_font(path, size), color)
+    return atlases[key]
+
+class GlyphAtlas:
+    def __init__(self, font, color, characters = atlas_characters):
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+
+        # every character rendered once, side by side on one surface, each glyph is a subsurface of it
+        renders = [(character, font.render(character, False, color)) for character in characters]
+        self.surface = pygame.Surface((sum(surf.get_width() for character, surf in renders), self.height), pygame.SRCALPHA)
+        self.glyphs = {}
+        x = 0
+        for character, surf in renders:
+            self.surface.blit(surf, (x, 0))
+            self.glyphs[character] = self.surface.subsurface((x, 0, surf.get_width(), self.height))
+            x += surf.get_width()
+
+        # finished strings, least recently used first
+        self.strings = OrderedDict()
+
+    def render(self, text):
+        # the surface for text, rebuilt only the first time a string is asked for
+        if text in self.strings:
+            self.strings.move_to_end(text)
+            return self.strings[text]
+
+        if all(character in self.glyphs for character in text):
+            glyphs = [self.glyphs[character] for character in text]
+            surf = pygame.Surface((max(sum(glyph.get_width() for glyph in glyphs), 1), self.height), pygame.SRCALPHA)
+            x = 0
+            for glyph in glyphs:
+                surf.blit(glyph, (x, 0))
+                x += glyph.get_width()
+        else:
+            surf = self.font.render(text, False, self.color)
+
+        self.strings[text] = surf
+        if len(self.strings) > text_cache_size:
+            self.strings.popitem(last = False)
+        return surf
@@ -0,0 +1,37 @@
+# tilemap.py
+import numpy as np
+from settings import tile_size
+
+class TileMap:
+    def __init__(self, layers):
+        # layer name -> int16 array of rows x columns, -1 marks an empty cell
+        self.layers = layers
+        self.rows, self.columns = layers['terrain'].shape
+        self.width = self.columns * tile_size
+        self.height = self.rows * tile_size
+        self.cell_cache = {}
+
+    def layer(self, name):
+        return self.layers[name]
+
+    def cells(self, name):
+        # (row, column, value) of every non-empty cell, in row-major order
+        if name not in self.cell_cache:
+            layer = self.layers[name]
+            rows, columns = np.nonzero(layer != -1)
+            self.cell_cache[name] = list(zip(rows.tolist(), columns.tolist(), layer[rows, columns].tolist()))
+        return self.cell_cache[name]
+
+    def cells_with(self, name, value):
+        rows, columns = np.nonzero(self.layers[name] == value)
+        return list(zip(rows.tolist(), columns.tolist()))
+
+    def count(self, name):
+        return int(np.count_nonzero(self.layers[name] != -1))
+
+    def bounding_box(self, name):
+        # (top, left, bottom, right) in cells, inclusive, or None for an empty layer
+        rows, columns = np.nonzero(self.layers[name] != -1)
+        if rows.size == 0:
+            return None
+        return int(rows.min()), int(columns.min()), int(rows.max()), int(columns.max())
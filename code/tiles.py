@@ -1,5 +1,6 @@
 import pygame
-from support import import_folder
+from support import import_image
+from animation import import_clip
 
 class Tile(pygame.sprite.Sprite):
     def __init__(self, size, x, y):
@@ -8,8 +9,8 @@ class Tile(pygame.sprite.Sprite):
         self.y = y
         self.image = pygame.Surface((size, size))
         self.rect = self.image.get_rect(topleft = (x, y))
-    def update(self, shift):
-        self.rect.x += shift
+    def update(self):
+        pass
 
 class StaticTile(Tile):
     def __init__(self, size, x, y, surface):
@@ -18,13 +19,13 @@ class StaticTile(Tile):
 
 class Crate(StaticTile):
     def __init__(self, size, x, y):
-        super().__init__(size, x, y, pygame.image.load('../graphics/terrain/crate.png').convert_alpha())
+        super().__init__(size, x, y, import_image('../graphics/terrain/crate.png'))
         offset_y = y + size
         self.rect = self.image.get_rect(bottomleft=(x, offset_y))
 
 class Heart(StaticTile):
     def __init__(self, size, x, y, value):
-        heart_surf = pygame.image.load('../graphics/character/heart.png').convert_alpha()
+        heart_surf = import_image('../graphics/character/heart.png')
         self.image = pygame.transform.smoothscale(heart_surf, (30, 30))
         super().__init__(size, x, y, self.image)
         offset_y = y + size - 10
@@ -33,32 +34,31 @@ class Heart(StaticTile):
 
 
 class AnimatedTile(Tile):
-    def __init__(self, size, x, y, path):
+    def __init__(self, size, x, y, clip_name):
         super().__init__(size, x, y)
-        self.frames = import_folder(path)
+        self.clip = import_clip(clip_name)
         self.frame_index = 0
-        self.image = self.frames[self.frame_index]
+        self.image = self.clip.frame(self.frame_index)
     
     def animate(self):
-        self.frame_index += 0.15
-        if self.frame_index >= len(self.frames):
+        self.frame_index += self.clip.speed
+        if self.frame_index >= len(self.clip):
             self.frame_index = 0
-        self.image = self.frames[int(self.frame_index)]
+        self.image = self.clip.frame(self.frame_index)
 
-    def update(self, shift):
+    def update(self):
         self.animate()
-        self.rect.x += shift
 
 class Coin(AnimatedTile):
-    def __init__(self, size, x, y, path, value):
-        super().__init__(size, x, y, path)
+    def __init__(self, size, x, y, clip_name, value):
+        super().__init__(size, x, y, clip_name)
         center_x = x + int(size / 2)
         center_y = y + int(size / 2)
         self.rect = self.image.get_rect(center = (center_x, center_y))
         self.value = value
 
 class Palm(AnimatedTile):
-    def __init__(self, size, x, y, path, offset):
-        super().__init__(size, x, y, path)
+    def __init__(self, size, x, y, clip_name, offset):
+        super().__init__(size, x, y, clip_name)
         offset_y = y - offset 
         self.rect.topleft = (x, offset_y)
@@ -0,0 +1,66 @@
+# tmx.py
+import os
+import base64
+import gzip
+import zlib
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+
+## Tiled layer names that differ from the names used in game_data
+layer_name_map = {
+    'fg_palms': 'fg palms',
+    'bg_palms': 'bg palms'
+}
+
+# tiled stores mirroring and rotation in the top bits of every global tile id
+flip_flags = 0xE0000000
+
+tmx_cache = {}
+
+def decode_layer_data(data, width, height):
+    encoding = data.get('encoding')
+    compression = data.get('compression')
+
+    if encoding == 'csv':
+        gids = np.array([int(value) for value in data.text.replace('\n', '').split(',') if value.strip()], dtype = np.uint32)
+    elif encoding == 'base64':
+        raw = base64.b64decode(data.text.strip())
+        if compression == 'zlib':
+            raw = zlib.decompress(raw)
+        elif compression == 'gzip':
+            raw = gzip.decompress(raw)
+        elif compression is not None:
+            raise ValueError(f'Unsupported tmx layer compression: {compression}')
+        gids = np.frombuffer(raw, dtype = '<u4')
+    else:
+        raise ValueError(f'Unsupported tmx layer encoding: {encoding}')
+
+    return gids.reshape(height, width) & ~np.uint32(flip_flags)
+
+def to_local_ids(gids, firstgids):
+    # global ids -> ids inside their own tileset, the same values the csv export writes, -1 for empty
+    firstgids = np.array(firstgids, dtype = np.int64)
+    gids = gids.astype(np.int64)
+    tileset_index = np.clip(np.searchsorted(firstgids, gids, side = 'right') - 1, 0, None)
+    return np.where(gids == 0, -1, gids - firstgids[tileset_index]).astype('<i2')
+
+def load_tmx(path):
+    # every tile layer of a map in one pass, cached until the file changes
+    modified_time = os.path.getmtime(path)
+    if path in tmx_cache and tmx_cache[path][0] == modified_time:
+        return tmx_cache[path][1]
+
+    root = ElementTree.parse(path).getroot()
+
+    # only the first gid of every tileset is needed, external tileset files are never opened
+    firstgids = sorted(int(tileset.get('firstgid')) for tileset in root.findall('tileset'))
+
+    layers = {}
+    for layer in root.findall('layer'):
+        name = layer.get('name')
+        name = layer_name_map.get(name, name)
+        gids = decode_layer_data(layer.find('data'), int(layer.get('width')), int(layer.get('height')))
+        layers[name] = to_local_ids(gids, firstgids)
+
+    tmx_cache[path] = (modified_time, layers)
+    return layers
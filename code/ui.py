@@ -1,4 +1,8 @@
 import pygame
+from time import perf_counter
+from support import import_image
+from text import load_font, get_atlas
+from settings import ui_font
 
 class UI:
     def __init__(self, surface):
@@ -7,15 +11,29 @@ class UI:
         self.display_surface = surface
 
         # health 
-        self.health_bar = pygame.image.load('../graphics/ui/health_bar.png').convert_alpha()
+        self.health_bar = import_image('../graphics/ui/health_bar.png')
         self.health_bar_top_left = (54, 39)
         self.bar_max_width = 152
         self.bar_height = 4
 
         # coins
-        self.coin = pygame.image.load('../graphics/ui/coin.png').convert_alpha()
+        self.coin = import_image('../graphics/ui/coin.png')
         self.coin_rect = self.coin.get_rect(topleft = (50, 61))
-        self.font = pygame.font.Font('../graphics/ui/ARCADEPI.ttf', 30)
+        self.coin_text = get_atlas(ui_font, 30, '#33323d')
+        # the count is only rendered again when it changes
+        self.coin_amount = None
+        self.coin_amount_surf = None
+        self.coin_amount_rect = None
+
+        # loading screen
+        self.loading_bar_rect = pygame.Rect(0, 0, 400, 24)
+        self.loading_bar_rect.center = (surface.get_width() // 2, surface.get_height() // 2)
+
+        # profiler overlay, the text is redrawn a few times a second so it stays readable
+        self.profiler_font = load_font(None, 22)
+        self.profiler_panel = None
+        self.profiler_panel_time = 0
+        self.profiler_refresh = 0.25
 
     def show_health(self, current, full):
         self.display_surface.blit(self.health_bar, (20, 10))
@@ -28,6 +46,50 @@ class UI:
 
     def show_coins(self, amount):
         self.display_surface.blit(self.coin, self.coin_rect)
-        coin_amount_surf = self.font.render(str(amount), False, '#33323d')
-        coin_amount_rect = coin_amount_surf.get_rect(midleft = (self.coin_rect.right + 4, self.coin_rect.centery))
-        self.display_surface.blit(coin_amount_surf, coin_amount_rect)
\ No newline at end of file
+        if amount != self.coin_amount:
+            self.coin_amount = amount
+            self.coin_amount_surf = self.coin_text.render(str(amount))
+            self.coin_amount_rect = self.coin_amount_surf.get_rect(midleft = (self.coin_rect.right + 4, self.coin_rect.centery))
+        self.display_surface.blit(self.coin_amount_surf, self.coin_amount_rect)
+
+    def show_loading(self, progress):
+        self.display_surface.fill('#33323d')
+        loading_surf = get_atlas(ui_font, 30, 'white').render('LOADING')
+        loading_rect = loading_surf.get_rect(midbottom = (self.loading_bar_rect.centerx, self.loading_bar_rect.top - 10))
+        self.display_surface.blit(loading_surf, loading_rect)
+
+        progress_rect = self.loading_bar_rect.copy()
+        progress_rect.width = self.loading_bar_rect.width * progress
+        pygame.draw.rect(self.display_surface, '#dc4949', progress_rect)
+        pygame.draw.rect(self.display_surface, 'white', self.loading_bar_rect, 2)
+
+    def show_profiler(self, profiler, sprite_counts):
+        current_time = perf_counter()
+        if self.profiler_panel is None or current_time - self.profiler_panel_time >= self.profiler_refresh:
+            self.profiler_panel = self.create_profiler_panel(profiler.summary(), sprite_counts)
+            self.profiler_panel_time = current_time
+        self.display_surface.blit(self.profiler_panel, self.profiler_panel.get_rect(topright = (self.display_surface.get_width() - 10, 10)))
+
+    def create_profiler_panel(self, summary, sprite_counts):
+        # rows of (label, value), the values are right aligned
+        if summary is None:
+            rows = [('profiling...', '')]
+        else:
+            rows = [('frame', f"{summary['frame']:.2f} ms"), ('max', f"{summary['max']:.2f} ms"), ('fps', f"{summary['fps']:.0f}")]
+            rows += [(name, f'{time:.2f} ms') for name, time in summary['sections'].items()]
+        if sprite_counts:
+            rows.append(('', ''))
+            rows += [(name, str(count)) for name, count in sprite_counts.items()]
+        rows.append(('', ''))
+        rows.append(('F3 hide, F4 save csv', ''))
+
+        line_height = self.profiler_font.get_linesize()
+        rendered = [(self.profiler_font.render(label, True, 'white'), self.profiler_font.render(value, True, 'white')) for label, value in rows]
+        width = max(label.get_width() + value.get_width() for label, value in rendered) + 40
+        panel = pygame.Surface((width, line_height * len(rows) + 20), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for index, (label, value) in enumerate(rendered):
+            y = 10 + index * line_height
+            panel.blit(label, (10, y))
+            panel.blit(value, value.get_rect(topright = (width - 10, y)))
+        return panel